@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del proceso ETL para el Dataset de Kaggle Survey
+
+Propósito: Medir el tiempo de arranque en frío del CLI (cada invocación es un
+proceso nuevo, como ocurre desde el orquestador) y, si se indica un dataset,
+el tiempo de cada subcomando
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'etl_kaggle_survey.py')
+
+
+def time_command(args, repeat):
+    """
+    Ejecuta el CLI en procesos nuevos y mide el tiempo de pared
+
+    Args:
+        args (list): Argumentos para etl_kaggle_survey.py
+        repeat (int): Número de repeticiones
+
+    Returns:
+        list: Tiempos en segundos de cada ejecución
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, SCRIPT] + args, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(label, times):
+    """
+    Imprime una línea de resultados del benchmark
+    """
+    print(f"{label:<28} mediana: {statistics.median(times) * 1000:9.1f} ms   "
+          f"mín: {min(times) * 1000:9.1f} ms   n={len(times)}")
+
+
+def main():
+    """
+    Función principal del benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark del CLI ETL de Kaggle Survey')
+    parser.add_argument('-i', '--input', help='Dataset CSV para medir los subcomandos')
+    parser.add_argument('-o', '--output', default='bench_output',
+                        help='Directorio de salida para los archivos generados')
+    parser.add_argument('-r', '--repeat', type=int, default=10,
+                        help='Repeticiones de la medición de arranque en frío')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK DEL PROCESO ETL")
+    print("=" * 80)
+
+    # Arranque en frío: intérprete + importaciones + parseo de argumentos
+    report('Arranque en frío (--help)', time_command(['--help'], args.repeat))
+
+    # Invocación liviana real: listar las vistas de las salidas (solo DuckDB)
+    try:
+        report('Subcomando query (vistas)', time_command(['query', '-o', args.output], args.repeat))
+    except subprocess.CalledProcessError:
+        print("⚠️ Subcomando query omitido: requiere DuckDB (pip install duckdb)")
+
+    if args.input:
+        common = ['-i', args.input, '-o', args.output]
+        for command in ['extract', 'profile', 'clean']:
+            report(f"Subcomando {command}", time_command([command] + common, 1))
+        report('Subcomando export (csv)', time_command(['export', '-f', 'csv'] + common, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capa de consultas analíticas sobre las salidas del ETL de Kaggle Survey
+
+Propósito: Registrar el dataset limpio y las demás salidas del proceso como
+vistas de DuckDB, de modo que las agrupaciones ad hoc (país, categoría
+salarial, marcas de opción múltiple) se ejecuten vectorizadas y fuera de
+memoria directamente sobre los archivos, con proyección y filtros empujados
+al lector, sin cargar el dataset completo en pandas.
+
+DuckDB es una dependencia opcional: solo se importa al usar esta capa.
+"""
+
+import glob
+import os
+
+# Vistas registradas a partir de las salidas del ETL
+CLEAN_VIEW = 'encuesta_limpia'
+INCREMENTAL_VIEW = 'encuesta_incremental'
+ORIGINAL_VIEW = 'encuesta_original'
+
+# Valor con el que la limpieza imputa las respuestas categóricas vacías
+NO_ANSWER = 'No especificado'
+
+
+def _import_duckdb():
+    """
+    Importa DuckDB bajo demanda con un mensaje claro si no está instalado
+    """
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "La capa de consultas requiere DuckDB: pip install duckdb"
+        ) from e
+    return duckdb
+
+
+def _quote_identifier(name):
+    """
+    Cita un nombre de columna o vista para SQL
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _quote_literal(text):
+    """
+    Cita un texto (rutas de archivo) como literal SQL
+    """
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def _reader(path):
+    """
+    Expresión SQL que lee un archivo (o patrón glob) según su formato
+    """
+    if path.endswith('.parquet'):
+        return f"read_parquet({_quote_literal(path)})"
+    return f"read_csv_auto({_quote_literal(path)}, union_by_name=true)"
+
+
+def export_parquet(df, path):
+    """
+    Exporta un DataFrame a Parquet usando DuckDB (sin requerir pyarrow)
+
+    Args:
+        df (pd.DataFrame): Dataset a exportar
+        path (str): Ruta del archivo Parquet
+    """
+    duckdb = _import_duckdb()
+    with duckdb.connect() as connection:
+        connection.register('datos', df)
+        connection.execute(f"COPY datos TO {_quote_literal(path)} (FORMAT PARQUET)")
+
+
+def csv_to_parquet(csv_path, parquet_path):
+    """
+    Convierte un CSV a Parquet en streaming, sin cargarlo en memoria
+
+    Args:
+        csv_path (str): Ruta del CSV de entrada
+        parquet_path (str): Ruta del archivo Parquet
+    """
+    duckdb = _import_duckdb()
+    with duckdb.connect() as connection:
+        connection.execute(
+            f"COPY (SELECT * FROM {_reader(csv_path)}) TO {_quote_literal(parquet_path)} (FORMAT PARQUET)"
+        )
+
+
+class QueryLayer:
+    """
+    Conexión DuckDB con las salidas del ETL registradas como vistas
+    """
+
+    def __init__(self, database=':memory:'):
+        """
+        Abre la conexión embebida
+
+        Args:
+            database (str): Base de datos DuckDB (por defecto en memoria)
+        """
+        duckdb = _import_duckdb()
+        self.connection = duckdb.connect(database)
+        self.views = {}
+        self._errors = duckdb.Error     # SQL inválido, vistas o archivos inexistentes
+
+    def register_view(self, name, path):
+        """
+        Registra un archivo (o patrón glob de particiones) como vista.
+        La vista no copia datos: cada consulta lee los archivos.
+        Los errores de DuckDB se reportan como ValueError.
+
+        Args:
+            name (str): Nombre de la vista
+            path (str): Archivo CSV/Parquet o patrón glob
+        """
+        try:
+            self.connection.execute(
+                f"CREATE OR REPLACE VIEW {_quote_identifier(name)} AS SELECT * FROM {_reader(path)}"
+            )
+        except self._errors as e:
+            raise ValueError(str(e)) from e
+        self.views[name] = path
+
+    def register_outputs(self, output_dir='.', file_path=None):
+        """
+        Registra las salidas del ETL encontradas en el directorio de salida:
+        el dataset limpio más reciente según la marca de tiempo del nombre
+        (Parquet si ambos formatos tienen la misma), las particiones
+        incrementales y el CSV original
+
+        Args:
+            output_dir (str): Directorio de salida del ETL
+            file_path (str): CSV original del dataset (opcional)
+
+        Returns:
+            dict: Vistas registradas (nombre -> ruta)
+        """
+        cleaned = glob.glob(os.path.join(output_dir, 'kaggle_survey_cleaned_*.parquet'))
+        cleaned += glob.glob(os.path.join(output_dir, 'kaggle_survey_cleaned_*.csv'))
+        if cleaned:
+            # Orden por marca de tiempo; a igual marca, Parquet antes que CSV
+            latest = max(cleaned, key=lambda path: (os.path.splitext(os.path.basename(path))[0],
+                                                    path.endswith('.parquet')))
+            self.register_view(CLEAN_VIEW, latest)
+
+        partitions = os.path.join(output_dir, 'kaggle_survey_cleaned', 'part-*.csv')
+        if glob.glob(partitions):
+            self.register_view(INCREMENTAL_VIEW, partitions)
+
+        if file_path and os.path.exists(file_path):
+            self.register_view(ORIGINAL_VIEW, file_path)
+
+        return dict(self.views)
+
+    def query(self, sql, params=None):
+        """
+        Ejecuta una consulta SQL y devuelve solo el resultado en pandas.
+        Los errores de DuckDB se reportan como ValueError.
+
+        Args:
+            sql (str): Consulta SQL sobre las vistas registradas
+            params (list): Parámetros posicionales ($1, ?) de la consulta
+
+        Returns:
+            pd.DataFrame: Resultado de la consulta
+        """
+        try:
+            return self.connection.execute(sql, params or []).df()
+        except self._errors as e:
+            raise ValueError(str(e)) from e
+
+    def group_counts(self, by, view=CLEAN_VIEW, where=None, flags=None, limit=None):
+        """
+        Cuenta respuestas agrupadas por una o varias columnas
+
+        Args:
+            by (list): Columnas de agrupación (p. ej. ['Pais_Residencia'])
+            view (str): Vista sobre la que se agrupa
+            where (str): Filtro SQL opcional (p. ej. "Genero = 'Female'")
+            flags (list): Columnas de opción múltiple; se cuenta cuántas
+                respuestas marcaron cada opción
+            limit (int): Número máximo de grupos
+
+        Returns:
+            pd.DataFrame: Grupos ordenados por número de respuestas
+        """
+        if isinstance(by, str):
+            by = [by]
+        columns = [_quote_identifier(col) for col in by]
+        metrics = ['COUNT(*) AS Respuestas']
+        for flag in flags or []:
+            col = _quote_identifier(flag)
+            metrics.append(
+                f"COUNT(*) FILTER (WHERE {col} IS NOT NULL AND CAST({col} AS VARCHAR) <> "
+                f"{_quote_literal(NO_ANSWER)}) AS {col}"
+            )
+
+        sql = f"SELECT {', '.join(columns + metrics)} FROM {_quote_identifier(view)}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" GROUP BY {', '.join(columns)} ORDER BY Respuestas DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.query(sql)
+
+    def close(self):
+        """
+        Cierra la conexión
+        """
+        self.connection.close()
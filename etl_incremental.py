@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingesta incremental de respuestas nuevas del dataset de Kaggle Survey
+
+Propósito: Procesar solo las respuestas añadidas al CSV desde la última
+ejecución. Se guarda una marca de agua (posición en bytes del archivo), las
+huellas de las filas ya procesadas (para descartar duplicados históricos) y
+acumuladores de estadísticas globales (nulos por columna e histogramas de
+valores numéricos) que permiten recalcular medianas y porcentajes de nulos
+sin releer el historial.
+
+Las huellas se guardan en segmentos ordenados de solo anexión: cada ejecución
+escribe un segmento con sus filas nuevas y los segmentos se fusionan cuando el
+último alcanza la mitad del anterior, de modo que hay O(log n) segmentos y el
+costo de cada ejecución no crece con el historial completo.
+"""
+
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STATE_FILE = 'estado_incremental.json'
+
+# Bytes anteriores a la marca de agua cuya huella se guarda para comprobar
+# que el archivo solo creció (y no se regeneró con otro contenido)
+TAIL_BYTES = 4096
+
+
+class IncrementalState:
+    """
+    Estado persistente de la ingesta incremental
+    """
+
+    VERSION = 3
+
+    def __init__(self, state_dir):
+        """
+        Inicializa un estado vacío
+
+        Args:
+            state_dir (str): Directorio donde se guarda el estado
+        """
+        self.state_dir = state_dir
+        self.offset = 0                 # Marca de agua: bytes ya procesados
+        self.tail_hash = None           # Huella de los bytes previos a la marca
+        self.read_rows = 0              # Filas del CSV leídas (con duplicados)
+        self.header_hash = None         # Huella de la cabecera del CSV
+        self.columns = []               # Columnas del CSV original
+        self.numeric_columns = []       # Columnas numéricas (primera ejecución)
+        self.dropped_columns = None     # Esquema congelado en la primera ejecución
+        self.rows = 0                   # Filas únicas acumuladas
+        self.null_counts = {}           # columna -> nulos acumulados
+        self.histograms = {}            # columna numérica -> {valor: conteo}
+        self.partitions = []            # Archivos de salida generados
+        self.segments = []              # Segmentos de huellas guardados
+        self.next_segment = 0           # Número del próximo segmento
+        self._loaded = {}               # segmento -> huellas (memmap)
+        self._pending = []              # Huellas nuevas aún no guardadas
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, state_dir):
+        """
+        Carga el estado guardado (o uno vacío si no existe)
+
+        Args:
+            state_dir (str): Directorio del estado
+
+        Returns:
+            IncrementalState: Estado cargado
+        """
+        state = cls(state_dir)
+        path = os.path.join(state_dir, STATE_FILE)
+        if not os.path.exists(path):
+            return state
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"Versión de estado no soportada: {data.get('version')}")
+
+        state.offset = data['offset']
+        state.tail_hash = data['tail_hash']
+        state.read_rows = data['read_rows']
+        state.header_hash = data['header_hash']
+        state.columns = data['columns']
+        state.numeric_columns = data['numeric_columns']
+        state.dropped_columns = data['dropped_columns']
+        state.rows = data['rows']
+        state.null_counts = data['null_counts']
+        state.histograms = {
+            col: {float(value): count for value, count in pairs}
+            for col, pairs in data['histograms'].items()
+        }
+        state.partitions = data['partitions']
+        state.segments = data['segments']
+        state.next_segment = data['next_segment']
+        return state
+
+    def save(self):
+        """
+        Guarda el estado en disco: escribe solo el segmento de huellas de esta
+        ejecución (más las fusiones pendientes) y reemplaza el JSON de forma
+        atómica; los segmentos fusionados se borran al final
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        obsolete = []
+        if self._pending:
+            new = self._pending[0]
+            for fingerprints in self._pending[1:]:
+                new = _merge_sorted(new, fingerprints)
+            self._pending = []
+            self.segments.append(self._write_segment(new))
+            obsolete = self._compact_segments()
+
+        data = {
+            'version': self.VERSION,
+            'offset': self.offset,
+            'tail_hash': self.tail_hash,
+            'read_rows': self.read_rows,
+            'header_hash': self.header_hash,
+            'columns': self.columns,
+            'numeric_columns': self.numeric_columns,
+            'dropped_columns': self.dropped_columns,
+            'rows': self.rows,
+            'null_counts': self.null_counts,
+            'histograms': {
+                col: [[value, count] for value, count in sorted(hist.items())]
+                for col, hist in self.histograms.items()
+            },
+            'partitions': self.partitions,
+            'segments': self.segments,
+            'next_segment': self.next_segment
+        }
+        path = os.path.join(self.state_dir, STATE_FILE)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+        for name in obsolete:
+            os.remove(os.path.join(self.state_dir, name))
+
+    def _write_segment(self, fingerprints):
+        """
+        Escribe un segmento de huellas ordenadas y devuelve su nombre
+        """
+        name = f"huellas-{self.next_segment:06d}.npy"
+        self.next_segment += 1
+        temp_path = os.path.join(self.state_dir, f"{name}.tmp.npy")
+        np.save(temp_path, fingerprints)
+        os.replace(temp_path, os.path.join(self.state_dir, name))
+        self._loaded[name] = fingerprints
+        return name
+
+    def _segment(self, name):
+        """
+        Huellas de un segmento guardado (mapeadas desde disco, sin leerlas)
+        """
+        if name not in self._loaded:
+            self._loaded[name] = np.load(os.path.join(self.state_dir, name), mmap_mode='r')
+        return self._loaded[name]
+
+    def _compact_segments(self):
+        """
+        Fusiona los últimos segmentos mientras el último sea al menos la
+        mitad del anterior
+
+        Returns:
+            list: Segmentos reemplazados (se borran tras guardar el JSON)
+        """
+        obsolete = []
+        while len(self.segments) >= 2:
+            previous, last = self.segments[-2:]
+            if 2 * len(self._segment(last)) < len(self._segment(previous)):
+                break
+            merged = _merge_sorted(self._segment(previous), self._segment(last))
+            for name in (previous, last):
+                self._loaded.pop(name)
+                obsolete.append(name)
+            self.segments[-2:] = [self._write_segment(merged)]
+        return obsolete
+
+    # ------------------------------------------------------------------
+    # Extracción de la parte nueva del archivo
+    # ------------------------------------------------------------------
+    def read_new_rows(self, file_path):
+        """
+        Lee solo las filas añadidas al CSV desde la marca de agua.
+        Las filas se etiquetan con su posición en el CSV (como en una lectura
+        completa), de modo que las etiquetas no se repiten entre ejecuciones.
+        Si la cabecera cambió, el archivo es más corto o los bytes previos a
+        la marca de agua ya no son los procesados (el archivo se regeneró),
+        se lanza un error: el estado debe reconstruirse desde cero.
+
+        Args:
+            file_path (str): Ruta al archivo CSV del dataset
+
+        Returns:
+            tuple: (pd.DataFrame con las filas nuevas, nuevo offset,
+                huella de los bytes previos al nuevo offset)
+        """
+        with open(file_path, 'rb') as f:
+            header = f.readline()
+            header_hash = hashlib.sha1(header).hexdigest()
+            size = os.fstat(f.fileno()).st_size
+
+            if self.header_hash is None:
+                self.header_hash = header_hash
+                self.columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+                self.offset = len(header)
+                self.tail_hash = _tail_hash(f, self.offset)
+            elif (header_hash != self.header_hash or size < self.offset
+                  or _tail_hash(f, self.offset) != self.tail_hash):
+                raise ValueError(
+                    "El archivo de entrada no es una extensión del ya procesado; "
+                    f"elimine {self.state_dir} para reprocesar desde cero"
+                )
+
+            f.seek(self.offset)
+            new_bytes = f.read(size - self.offset)
+
+            # Una línea incompleta al final se deja para la próxima ejecución
+            end = new_bytes.rfind(b'\n') + 1
+            new_bytes = new_bytes[:end]
+            if not new_bytes.strip():
+                return pd.DataFrame(columns=self.columns), self.offset, self.tail_hash
+            tail_hash = _tail_hash(f, self.offset + end)
+
+        dtype = None
+        if self.numeric_columns:
+            dtype = {c: object for c in self.columns if c not in self.numeric_columns}
+        df = pd.read_csv(io.BytesIO(new_bytes), header=None, names=self.columns,
+                         dtype=dtype, encoding='utf-8')
+        df.index = pd.RangeIndex(self.read_rows, self.read_rows + len(df))
+        return df, self.offset + end, tail_hash
+
+    # ------------------------------------------------------------------
+    # Huellas y acumuladores
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _fingerprints_of(df):
+        """
+        Calcula la huella de cada fila sobre el texto de cada valor, sin
+        depender del tipo inferido en cada lote: los valores que se leen como
+        número se escriben como float (300 y 300.0 coinciden) y el resto se
+        conserva tal cual, de modo que ningún texto se pierde al comparar
+        """
+        normalized = {}
+        for col in df.columns:
+            values = df[col]
+            numbers = pd.to_numeric(values, errors='coerce')
+            normalized[col] = values.astype(object).where(
+                numbers.isna(), numbers.astype('float64')
+            ).astype(str)
+        normalized = pd.DataFrame(normalized, index=df.index)
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+    def register(self, df):
+        """
+        Descarta filas ya procesadas (o duplicadas en el lote) y actualiza
+        los acumuladores globales con las filas nuevas
+
+        Args:
+            df (pd.DataFrame): Filas leídas desde la marca de agua
+
+        Returns:
+            pd.DataFrame: Filas nuevas y únicas
+        """
+        if not self.numeric_columns and self.dropped_columns is None:
+            # Una columna vacía en el primer lote se lee como float, pero no
+            # hay evidencia de que sea numérica: se trata como texto
+            self.numeric_columns = [
+                col for col in df.select_dtypes(include=[np.number]).columns
+                if df[col].notna().any()
+            ]
+
+        fingerprints = self._fingerprints_of(df)
+        _, first = np.unique(fingerprints, return_index=True)
+        unique = np.zeros(len(df), bool)
+        unique[first] = True
+        mask = unique & ~self._seen(fingerprints)
+
+        df = df[mask]
+        self._add_pending(np.sort(fingerprints[mask]))
+
+        self.rows += len(df)
+        for col, count in df.isnull().sum().items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(count)
+        for col in self.numeric_columns:
+            hist = self.histograms.setdefault(col, {})
+            for value, count in pd.to_numeric(df[col], errors='coerce').dropna().value_counts().items():
+                hist[float(value)] = hist.get(float(value), 0) + int(count)
+        return df
+
+    def _seen(self, fingerprints):
+        """
+        Indica qué huellas ya están en algún segmento (búsqueda binaria en
+        cada segmento ordenado)
+        """
+        seen = np.zeros(len(fingerprints), bool)
+        segments = [self._segment(name) for name in self.segments] + self._pending
+        for segment in segments:
+            if len(segment) == 0:
+                continue
+            positions = np.minimum(np.searchsorted(segment, fingerprints), len(segment) - 1)
+            seen |= segment[positions] == fingerprints
+        return seen
+
+    def _add_pending(self, fingerprints):
+        """
+        Agrega huellas nuevas (ordenadas) en memoria, fusionando los bloques
+        con el mismo criterio que los segmentos guardados
+        """
+        if len(fingerprints) == 0:
+            return
+        self._pending.append(fingerprints)
+        while len(self._pending) >= 2 and 2 * len(self._pending[-1]) >= len(self._pending[-2]):
+            last = self._pending.pop()
+            self._pending[-1] = _merge_sorted(self._pending[-1], last)
+
+    # ------------------------------------------------------------------
+    # Estadísticas globales
+    # ------------------------------------------------------------------
+    def missing_percentage(self):
+        """
+        Porcentaje global de nulos por columna
+
+        Returns:
+            pd.Series: Porcentaje por columna
+        """
+        if self.rows == 0:
+            return pd.Series(0.0, index=self.columns)
+        return pd.Series(self.null_counts, dtype='float64').reindex(self.columns).fillna(0) / self.rows * 100
+
+    def medians(self):
+        """
+        Mediana global de cada columna numérica calculada desde los histogramas
+
+        Returns:
+            dict: columna -> mediana
+        """
+        medians = {}
+        for col, hist in self.histograms.items():
+            if not hist:
+                continue
+            values = np.array(sorted(hist))
+            cumulative = np.cumsum([hist[v] for v in values])
+            total = cumulative[-1]
+            low = values[np.searchsorted(cumulative, (total + 1) // 2)]
+            high = values[np.searchsorted(cumulative, total // 2 + 1)]
+            medians[col] = float((low + high) / 2)
+        return medians
+
+    def drifted_columns(self, threshold=80):
+        """
+        Columnas cuyo porcentaje global de nulos cruzó el umbral después de
+        congelar el esquema (sugieren reconstruir la salida desde cero)
+
+        Returns:
+            list: Nombres de columnas
+        """
+        if self.dropped_columns is None:
+            return []
+        percentage = self.missing_percentage()
+        dropped = set(self.dropped_columns)
+        return [c for c, p in percentage.items() if (p > threshold) != (c in dropped)]
+
+
+def _tail_hash(f, offset):
+    """
+    Huella de los últimos TAIL_BYTES bytes anteriores a una posición del archivo
+    """
+    start = max(0, offset - TAIL_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _merge_sorted(a, b):
+    """
+    Fusiona dos arreglos de huellas ordenados sin reordenar el resultado
+    """
+    return np.insert(a, np.searchsorted(a, b), b)
@@ -9,22 +9,42 @@ Fecha: [Fecha Actual]
 Propósito: Análisis de datos de encuesta de Kaggle para profesionales en Ingeniería de Sistemas
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import gc
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+import sys
 
-# Configuración para mostrar todas las columnas
-pd.set_option('display.max_columns', None)
-pd.set_option('display.width', None)
 warnings.filterwarnings('ignore')
 
-# Configuración de matplotlib para español
-plt.rcParams['font.size'] = 10
-plt.rcParams['figure.figsize'] = (12, 8)
+# Filas por hoja admitidas por Excel (incluida la fila de encabezados)
+EXCEL_MAX_ROWS = 1048576
+
+
+def _import_dependencies():
+    """
+    Importa pandas, numpy y los módulos del proceso ETL al crear el primer
+    ETL: el CLI construye y valida sus argumentos (y responde --help o lista
+    las vistas de consulta) sin pagar estas importaciones
+    """
+    global pd, np, QueryLayer, csv_to_parquet, export_parquet, IncrementalState
+    global MemoryGovernor, categorize, StatisticsLedger, FreeTextIndex, source_identity
+    
+    import pandas as pd
+    import numpy as np
+    
+    from capa_consultas import QueryLayer, csv_to_parquet, export_parquet
+    from etl_incremental import IncrementalState
+    from gobernador_memoria import MemoryGovernor, categorize
+    from registro_estadisticas import StatisticsLedger
+    from indice_texto_libre import FreeTextIndex, source_identity
+    
+    # Configuración para mostrar todas las columnas
+    pd.set_option('display.max_columns', None)
+    pd.set_option('display.width', None)
+
 
 class ETLKaggleSurvey:
     """
@@ -32,16 +52,26 @@ class ETLKaggleSurvey:
     enfocado en Ingeniería de Sistemas
     """
     
-    def __init__(self, file_path):
+    def __init__(self, file_path, output_dir='.', workers=1, memory_budget_mb=None):
         """
         Inicializa la clase ETL
         
         Args:
             file_path (str): Ruta al archivo CSV del dataset
+            output_dir (str): Directorio donde se escriben los archivos generados
+            workers (int): Número de hilos para exportar formatos en paralelo
+            memory_budget_mb (float): Presupuesto de memoria en MB (None = sin límite)
         """
+        _import_dependencies()
         self.file_path = file_path
+        self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.governor = MemoryGovernor(memory_budget_mb) if memory_budget_mb else None
         self.df_original = None
         self.df_cleaned = None
+        self.ledger = None
+        self.text_index = None
+        self.queries = None
         self.column_mapping = self._create_column_mapping()
         
     def _create_column_mapping(self):
@@ -285,7 +315,14 @@ class ETLKaggleSurvey:
         try:
             # Cargar el dataset
             print(f"Cargando dataset desde: {self.file_path}")
-            self.df_original = pd.read_csv(self.file_path, encoding='utf-8')
+            if self.governor is None:
+                self.df_original = pd.read_csv(self.file_path, encoding='utf-8')
+            else:
+                # Lectura en una sola pasada con tipos reducidos y el mismo
+                # esquema que la lectura por bloques
+                if self.governor.chunk_size is None:
+                    self.governor.estimate(self.file_path)
+                self.df_original = self.governor.read_all(self.file_path)
             
             print(f"✅ Dataset cargado exitosamente")
             print(f"📊 Dimensiones del dataset: {self.df_original.shape}")
@@ -375,7 +412,7 @@ class ETLKaggleSurvey:
         print("FASE 2A: ANÁLISIS EXPLORATORIO DE DATOS (EDA)")
         print("=" * 80)
         
-        df = self.df_original.copy()
+        df = self.df_original
         
         # 1. Información general del dataset
         print("📊 1. INFORMACIÓN GENERAL DEL DATASET")
@@ -452,15 +489,105 @@ class ETLKaggleSurvey:
             'unique_counts': unique_counts
         }
     
-    def clean_and_transform_data(self):
+    def release_original(self):
+        """
+        Libera df_original en cuanto deja de ser necesario
+        (los reportes leen el registro de estadísticas, no el original)
+        """
+        if self.df_original is not None:
+            self.df_original = None
+            gc.collect()
+    
+    def _output_path(self, filename):
+        """
+        Construye la ruta de un archivo generado dentro del directorio de salida
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, filename)
+    
+    def build_text_index(self, index_path='indice_texto_libre.json.gz', frames=None, delta=False):
+        """
+        FASE 2C: ÍNDICE DE TEXTO LIBRE
+        Tokeniza y normaliza las respuestas *_OTHER_TEXT y actualiza el índice
+        invertido persistente (solo se indexan las respuestas nuevas). Si el
+        índice guardado proviene de otro archivo de entrada, se reconstruye
+        
+        Args:
+            index_path (str): Ruta del archivo de índice (None para no persistir)
+            frames (iterable): Bloques de datos a indexar (por defecto df_original)
+            delta (bool): Guardar solo las respuestas de frames como un segmento
+                delta, sin cargar el índice existente (filas que no se repiten)
+        
+        Returns:
+            FreeTextIndex: Índice con búsquedas por término, prefijo y similitud
+        """
+        print("\n" + "=" * 80)
+        print("FASE 2C: ÍNDICE DE TEXTO LIBRE")
+        print("=" * 80)
+        
+        # Se indexa sobre el dataset original porque la limpieza elimina
+        # la mayoría de columnas *_OTHER_TEXT (>80% valores faltantes)
+        if index_path:
+            index_path = self._output_path(index_path)
+        
+        if index_path and not delta:
+            # Las respuestas se identifican por (columna, fila): el índice solo
+            # se reutiliza para el mismo archivo o una extensión suya
+            try:
+                self.text_index = FreeTextIndex.load(index_path)
+            except ValueError:
+                self.text_index = FreeTextIndex()
+            source, same_source = source_identity(self.file_path, self.text_index.source)
+            if same_source:
+                print(f"Índice existente cargado desde: {index_path}")
+            else:
+                if os.path.exists(index_path):
+                    print("⚠️ El índice existente proviene de otro archivo de entrada: se reconstruye")
+                self.text_index = FreeTextIndex()
+            self.text_index.source = source
+        else:
+            self.text_index = FreeTextIndex()
+        
+        if frames is None:
+            frames = [self.df_original]
+        added = sum(self.text_index.add_responses(frame) for frame in frames)
+        print(f"Respuestas nuevas indexadas: {added:,}")
+        if not delta:
+            summary = self.text_index.summary()
+            print(f"Respuestas totales en el índice: {summary['responses']:,}")
+            print(f"Términos distintos: {summary['terms']:,}")
+        
+        if index_path and delta:
+            segments = self.text_index.save_delta(index_path)
+            print(f"✅ Segmento del índice guardado: {index_path} ({segments} segmentos delta)")
+        elif index_path:
+            self.text_index.save(index_path)
+            print(f"✅ Índice guardado: {index_path}")
+        
+        print("\n🔝 Top 5 respuestas escritas:")
+        for _, row in self.text_index.frequency_table(top=5).iterrows():
+            print(f"  • {row['Columna']}: {row['Respuesta']} ({row['Frecuencia']:,})")
+        
+        return self.text_index
+    
+    def clean_and_transform_data(self, df=None, columns_to_drop=None, medians=None):
         """
         FASE 2B: LIMPIEZA Y TRANSFORMACIÓN DE DATOS
+        
+        Args:
+            df (pd.DataFrame): Datos a limpiar (por defecto df_original)
+            columns_to_drop (list): Columnas a eliminar; si es None se eliminan
+                las que tienen más del 80% de valores faltantes en df
+            medians (dict): Medianas globales para imputar columnas numéricas;
+                si es None se usa la mediana de df
         """
         print("\n" + "=" * 80)
         print("FASE 2B: LIMPIEZA Y TRANSFORMACIÓN DE DATOS")
         print("=" * 80)
         
-        df = self.df_original.copy()
+        # drop_duplicates devuelve un nuevo DataFrame: no hace falta copiar la entrada
+        df = self.df_original if df is None else df
+        ledger = StatisticsLedger.from_frame(df)
         print(f"📊 Dataset inicial: {df.shape}")
         
         # 1. Eliminación de registros duplicados
@@ -469,6 +596,7 @@ class ETLKaggleSurvey:
         initial_rows = len(df)
         df = df.drop_duplicates()
         removed_duplicates = initial_rows - len(df)
+        ledger.record_duplicates(removed_duplicates)
         print(f"Registros eliminados por duplicación: {removed_duplicates}")
         print(f"Registros restantes: {len(df):,}")
         
@@ -478,26 +606,37 @@ class ETLKaggleSurvey:
         
         # Estrategia: Para columnas con más del 80% de valores faltantes, las eliminamos
         # Para el resto, imputamos con valores apropiados
-        missing_percentage = (df.isnull().sum() / len(df)) * 100
+        null_counts = df.isnull().sum()
+        missing_percentage = (null_counts / len(df)) * 100
         
         # Eliminar columnas con más del 80% de valores faltantes
-        columns_to_drop = missing_percentage[missing_percentage > 80].index
+        if columns_to_drop is None:
+            columns_to_drop = missing_percentage[missing_percentage > 80].index
+        else:
+            columns_to_drop = [col for col in columns_to_drop if col in df.columns]
         print(f"Columnas eliminadas (>80% valores faltantes): {len(columns_to_drop)}")
         df = df.drop(columns=columns_to_drop)
+        ledger.record_dropped(columns_to_drop)
+        null_counts = null_counts[df.columns]
         
         # Para columnas categóricas, imputar con "No especificado"
         categorical_cols = df.select_dtypes(include=['object']).columns
         for col in categorical_cols:
-            if df[col].isnull().sum() > 0:
+            if null_counts[col] > 0:
                 df[col] = df[col].fillna('No especificado')
+                ledger.record_imputed(col, null_counts[col])
         
         # Para columnas numéricas, imputar con la mediana
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         for col in numeric_cols:
-            if df[col].isnull().sum() > 0:
-                df[col] = df[col].fillna(df[col].median())
+            if null_counts[col] > 0:
+                median = medians[col] if medians and col in medians else df[col].median()
+                if pd.notna(median):
+                    df[col] = df[col].fillna(median)
+                    ledger.record_imputed(col, null_counts[col])
         
-        print(f"Valores nulos restantes: {df.isnull().sum().sum()}")
+        ledger.remaining_nulls = int(null_counts.sum()) - ledger.total_imputed
+        print(f"Valores nulos restantes: {ledger.remaining_nulls}")
         
         # 3. Limpieza de espacios en blanco
         print("\n🧹 3. LIMPIEZA DE ESPACIOS EN BLANCO")
@@ -524,9 +663,10 @@ class ETLKaggleSurvey:
         
         # Convertir columna de tiempo a numérico
         if 'Time from Start to Finish (seconds)' in df.columns:
-            df['Time from Start to Finish (seconds)'] = pd.to_numeric(
-                df['Time from Start to Finish (seconds)'], errors='coerce'
-            )
+            time_col = 'Time from Start to Finish (seconds)'
+            nulls_before = df[time_col].isnull().sum()
+            df[time_col] = pd.to_numeric(df[time_col], errors='coerce')
+            ledger.record_coerced(time_col, df[time_col].isnull().sum() - nulls_before)
         
         # 6. Renombrar columnas con descripciones descriptivas
         print("\n📝 6. RENOMBRADO DE COLUMNAS")
@@ -535,8 +675,9 @@ class ETLKaggleSurvey:
         # Crear mapeo solo para columnas que existen en el dataset
         existing_mapping = {k: v for k, v in self.column_mapping.items() if k in df.columns}
         df = df.rename(columns=existing_mapping)
+        ledger.record_renamed(existing_mapping)
         
-        print(f"Columnas renombradas: {len(existing_mapping)}")
+        print(f"Columnas renombradas: {len(ledger.renamed)}")
         print("Ejemplos de renombrado:")
         for i, (old_name, new_name) in enumerate(list(existing_mapping.items())[:5]):
             print(f"  • {old_name} → {new_name}")
@@ -560,6 +701,7 @@ class ETLKaggleSurvey:
                     return 'Experto (10+ años)'
             
             df['Categoria_Experiencia'] = df['Anos_Experiencia_Campo'].apply(categorize_experience)
+            ledger.record_derived('Categoria_Experiencia')
         
         # Crear categoría de salario
         if 'Rango_Salarial_Anual' in df.columns:
@@ -576,93 +718,131 @@ class ETLKaggleSurvey:
                     return 'Muy Alto (100k+)'
             
             df['Categoria_Salarial'] = df['Rango_Salarial_Anual'].apply(categorize_salary)
+            ledger.record_derived('Categoria_Salarial')
         
-        print(f"Columnas derivadas creadas: 2")
-        print("  • Categoria_Experiencia")
-        print("  • Categoria_Salarial")
+        print(f"Columnas derivadas creadas: {len(ledger.derived)}")
+        for col in ledger.derived:
+            print(f"  • {col}")
         
-        # Guardar dataset limpio
+        # Guardar dataset limpio y el registro de estadísticas
+        ledger.finalize(*df.shape)
         self.df_cleaned = df
+        self.ledger = ledger
         
         print(f"\n✅ LIMPIEZA COMPLETADA")
         print(f"📊 Dataset final: {df.shape}")
-        print(f"📉 Reducción de filas: {initial_rows - len(df):,}")
-        print(f"📉 Reducción de columnas: {self.df_original.shape[1] - df.shape[1]}")
+        print(f"📉 Reducción de filas: {ledger.original_rows - ledger.final_rows:,}")
+        print(f"📉 Reducción de columnas: {ledger.original_columns - ledger.final_columns}")
         
         return df
     
-    def load_data(self, output_format='csv'):
+    def _export_csv(self, csv_filename):
         """
-        FASE 3: CARGA DE DATOS
-        Exporta los datos limpios en diferentes formatos
+        Exporta el dataset limpio a CSV
+        
+        Returns:
+            str: Mensaje de confirmación
         """
-        print("\n" + "=" * 80)
-        print("FASE 3: CARGA DE DATOS")
-        print("=" * 80)
+        self.df_cleaned.to_csv(csv_filename, index=False, encoding='utf-8')
+        return f"✅ Dataset exportado a CSV: {csv_filename}"
+    
+    def _export_excel(self, excel_filename):
+        """
+        Exporta el dataset limpio y el resumen de cambios a Excel
+        (openpyxl solo se importa aquí, cuando se pide este formato)
         
-        if self.df_cleaned is None:
-            print("❌ Error: No hay datos limpios para exportar")
-            return None
+        Returns:
+            str: Mensaje de confirmación
+        """
+        with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
+            self.df_cleaned.to_excel(writer, sheet_name='Datos_Limpios', index=False)
+                
+            # Crear hoja con resumen de cambios (desde el registro de estadísticas)
+            summary_data = {
+                'Métrica': [metric for metric, _ in self.ledger.summary()],
+                'Valor': [f"{value:,}" for _, value in self.ledger.summary()]
+            }
+            summary_df = pd.DataFrame(summary_data)
+            summary_df.to_excel(writer, sheet_name='Resumen_Cambios', index=False)
+            
+        return f"✅ Dataset exportado a Excel: {excel_filename}"
+    
+    def _start_excel_stream(self):
+        """
+        Abre un libro de Excel de solo escritura para exportar el dataset
+        limpio por bloques, sin tenerlo completo en memoria
+        (openpyxl solo se importa aquí, cuando se pide este formato)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        Returns:
+            tuple: (libro, hoja 'Datos_Limpios')
+        """
+        from openpyxl import Workbook
         
-        # 1. Exportar a CSV
-        if output_format in ['csv', 'all']:
-            csv_filename = f"kaggle_survey_cleaned_{timestamp}.csv"
-            self.df_cleaned.to_csv(csv_filename, index=False, encoding='utf-8')
-            print(f"✅ Dataset exportado a CSV: {csv_filename}")
+        workbook = Workbook(write_only=True)
+        return workbook, workbook.create_sheet('Datos_Limpios')
+    
+    def _append_excel_rows(self, sheet, df, header=False):
+        """
+        Agrega un bloque del dataset limpio a una hoja de solo escritura
+        (los nulos quedan como celdas vacías, igual que con to_excel)
+        """
+        if header:
+            sheet.append(df.columns.tolist())
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    
+    def _finish_excel_stream(self, workbook, excel_filename):
+        """
+        Agrega la hoja con el resumen de cambios (desde el registro de
+        estadísticas) y guarda el libro exportado por bloques
         
-        # 2. Exportar a Excel
-        if output_format in ['excel', 'all']:
-            excel_filename = f"kaggle_survey_cleaned_{timestamp}.xlsx"
-            with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
-                self.df_cleaned.to_excel(writer, sheet_name='Datos_Limpios', index=False)
-                
-                # Crear hoja con resumen de cambios
-                summary_data = {
-                    'Métrica': [
-                        'Registros originales',
-                        'Registros finales',
-                        'Columnas originales',
-                        'Columnas finales',
-                        'Registros duplicados eliminados',
-                        'Columnas eliminadas (>80% nulos)',
-                        'Valores nulos imputados',
-                        'Columnas renombradas'
-                    ],
-                    'Valor': [
-                        f"{self.df_original.shape[0]:,}",
-                        f"{self.df_cleaned.shape[0]:,}",
-                        f"{self.df_original.shape[1]:,}",
-                        f"{self.df_cleaned.shape[1]:,}",
-                        f"{self.df_original.shape[0] - self.df_cleaned.shape[0]:,}",
-                        f"{self.df_original.shape[1] - self.df_cleaned.shape[1]:,}",
-                        f"{self.df_original.isnull().sum().sum() - self.df_cleaned.isnull().sum().sum():,}",
-                        f"{len(self.column_mapping):,}"
-                    ]
-                }
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Resumen_Cambios', index=False)
-            
-            print(f"✅ Dataset exportado a Excel: {excel_filename}")
+        Returns:
+            str: Mensaje de confirmación
+        """
+        summary = workbook.create_sheet('Resumen_Cambios')
+        summary.append(['Métrica', 'Valor'])
+        for metric, value in self.ledger.summary():
+            summary.append([metric, f"{value:,}"])
+        workbook.save(excel_filename)
+        return f"✅ Dataset exportado a Excel: {excel_filename}"
+    
+    def _export_parquet(self, parquet_filename):
+        """
+        Exporta el dataset limpio a Parquet (formato columnar para la capa
+        de consultas; DuckDB solo se importa cuando se pide este formato)
+        
+        Returns:
+            str: Mensaje de confirmación
+        """
+        export_parquet(self.df_cleaned, parquet_filename)
+        return f"✅ Dataset exportado a Parquet: {parquet_filename}"
+    
+    def _write_metadata(self, metadata_filename):
+        """
+        Escribe el archivo de metadatos del proceso ETL a partir del
+        registro de estadísticas
+        
+        Args:
+            metadata_filename (str): Ruta del archivo de metadatos
+        """
+        ledger = self.ledger
         
-        # 3. Crear archivo de metadatos
-        metadata_filename = f"metadata_etl_{timestamp}.txt"
         with open(metadata_filename, 'w', encoding='utf-8') as f:
             f.write("METADATOS DEL PROCESO ETL - KAGGLE SURVEY\n")
             f.write("=" * 50 + "\n\n")
             f.write(f"Fecha de procesamiento: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Archivo original: {self.file_path}\n")
-            f.write(f"Registros originales: {self.df_original.shape[0]:,}\n")
-            f.write(f"Registros finales: {self.df_cleaned.shape[0]:,}\n")
-            f.write(f"Columnas originales: {self.df_original.shape[1]:,}\n")
-            f.write(f"Columnas finales: {self.df_cleaned.shape[1]:,}\n\n")
+            f.write(f"Registros originales: {ledger.original_rows:,}\n")
+            f.write(f"Registros finales: {ledger.final_rows:,}\n")
+            f.write(f"Columnas originales: {ledger.original_columns:,}\n")
+            f.write(f"Columnas finales: {ledger.final_columns:,}\n\n")
             
             f.write("CAMBIOS REALIZADOS:\n")
             f.write("-" * 20 + "\n")
-            f.write("1. Eliminación de registros duplicados\n")
-            f.write("2. Eliminación de columnas con >80% valores faltantes\n")
-            f.write("3. Imputación de valores nulos:\n")
+            f.write(f"1. Eliminación de registros duplicados: {ledger.duplicate_rows:,}\n")
+            f.write(f"2. Eliminación de columnas con >80% valores faltantes: {len(ledger.dropped_columns):,}\n")
+            f.write(f"3. Imputación de valores nulos: {ledger.total_imputed:,}\n")
             f.write("   - Categóricas: 'No especificado'\n")
             f.write("   - Numéricas: Mediana\n")
             f.write("4. Limpieza de espacios en blanco\n")
@@ -672,15 +852,52 @@ class ETLKaggleSurvey:
             
             f.write("COLUMNAS RENOMBRADAS:\n")
             f.write("-" * 20 + "\n")
-            for old_name, new_name in self.column_mapping.items():
-                if old_name in self.df_original.columns:
-                    f.write(f"{old_name} → {new_name}\n")
+            for old_name, new_name in ledger.renamed.items():
+                f.write(f"{old_name} → {new_name}\n")
+    
+    def load_data(self, output_format='csv'):
+        """
+        FASE 3: CARGA DE DATOS
+        Exporta los datos limpios en diferentes formatos
+        """
+        print("\n" + "=" * 80)
+        print("FASE 3: CARGA DE DATOS")
+        print("=" * 80)
+        
+        if self.df_cleaned is None:
+            print("❌ Error: No hay datos limpios para exportar")
+            return None
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # 1. Exportar a CSV y 2. Exportar a Excel
+        # (con varios workers los formatos se escriben en paralelo)
+        exports = {}
+        if output_format in ['csv', 'all']:
+            csv_filename = self._output_path(f"kaggle_survey_cleaned_{timestamp}.csv")
+            exports[csv_filename] = self._export_csv
+        if output_format in ['excel', 'all']:
+            excel_filename = self._output_path(f"kaggle_survey_cleaned_{timestamp}.xlsx")
+            exports[excel_filename] = self._export_excel
+        if output_format == 'parquet':
+            parquet_filename = self._output_path(f"kaggle_survey_cleaned_{timestamp}.parquet")
+            exports[parquet_filename] = self._export_parquet
+        
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(exports)))) as executor:
+            futures = [executor.submit(export, filename) for filename, export in exports.items()]
+            for future in futures:
+                print(future.result())
+        
+        # 3. Crear archivo de metadatos
+        metadata_filename = self._output_path(f"metadata_etl_{timestamp}.txt")
+        self._write_metadata(metadata_filename)
         
         print(f"✅ Metadatos exportados: {metadata_filename}")
         
         return {
             'csv_file': csv_filename if output_format in ['csv', 'all'] else None,
             'excel_file': excel_filename if output_format in ['excel', 'all'] else None,
+            'parquet_file': parquet_filename if output_format == 'parquet' else None,
             'metadata_file': metadata_filename
         }
     
@@ -692,24 +909,27 @@ class ETLKaggleSurvey:
         print("REPORTE RESUMEN DEL PROCESO ETL")
         print("=" * 80)
         
-        if self.df_cleaned is None:
+        if self.ledger is None:
             print("❌ Error: No hay datos procesados para generar reporte")
             return
         
+        ledger = self.ledger
+        
         print(f"📊 RESUMEN EJECUTIVO:")
         print(f"   • Dataset procesado: Kaggle ML & Data Science Survey 2019")
-        print(f"   • Registros procesados: {self.df_cleaned.shape[0]:,}")
-        print(f"   • Variables finales: {self.df_cleaned.shape[1]:,}")
-        print(f"   • Tasa de retención: {(len(self.df_cleaned) / len(self.df_original)) * 100:.1f}%")
+        print(f"   • Registros procesados: {ledger.final_rows:,}")
+        print(f"   • Variables finales: {ledger.final_columns:,}")
+        print(f"   • Tasa de retención: {ledger.retention_rate():.1f}%")
         
         print(f"\n🔧 TRANSFORMACIONES APLICADAS:")
-        print(f"   • Registros duplicados eliminados: {len(self.df_original) - len(self.df_cleaned):,}")
-        print(f"   • Columnas eliminadas: {self.df_original.shape[1] - self.df_cleaned.shape[1]:,}")
-        print(f"   • Valores nulos imputados: {self.df_original.isnull().sum().sum() - self.df_cleaned.isnull().sum().sum():,}")
-        print(f"   • Columnas renombradas: {len(self.column_mapping):,}")
+        print(f"   • Registros duplicados eliminados: {ledger.duplicate_rows:,}")
+        print(f"   • Columnas eliminadas: {len(ledger.dropped_columns):,}")
+        print(f"   • Valores nulos imputados: {ledger.total_imputed:,}")
+        print(f"   • Valores convertidos a nulo: {ledger.total_coerced:,}")
+        print(f"   • Columnas renombradas: {len(ledger.renamed):,}")
         
         print(f"\n📈 CALIDAD DE DATOS:")
-        print(f"   • Completitud promedio: {((self.df_cleaned.notna().sum().sum()) / (self.df_cleaned.shape[0] * self.df_cleaned.shape[1])) * 100:.1f}%")
+        print(f"   • Completitud promedio: {ledger.completeness():.1f}%")
         print(f"   • Consistencia: Mejorada mediante normalización")
         print(f"   • Validez: Verificada mediante validación de tipos")
         
@@ -725,13 +945,17 @@ class ETLKaggleSurvey:
         Ejecuta el proceso ETL completo
         
         Args:
-            output_format (str): Formato de salida ('csv', 'excel', 'all')
+            output_format (str): Formato de salida ('csv', 'excel', 'parquet', 'all')
         """
         print("🚀 INICIANDO PROCESO ETL COMPLETO")
         print("Dataset: Kaggle Machine Learning & Data Science Survey 2019")
         print("Aplicación: Ingeniería de Sistemas")
         print("=" * 80)
         
+        # Presupuesto de memoria: decidir entre proceso en memoria o por bloques
+        if self.exceeds_budget():
+            return self.run_spilled_etl(output_format)
+        
         # Fase 1: Extracción
         if self.extract_data() is None:
             return False
@@ -742,49 +966,410 @@ class ETLKaggleSurvey:
         # Fase 2A: EDA
         eda_results = self.exploratory_data_analysis()
         
+        # Fase 2C: Índice de texto libre
+        self.build_text_index()
+        
         # Fase 2B: Limpieza y transformación
         self.df_cleaned = self.clean_and_transform_data()
         
+        # El original ya no se necesita: los reportes leen el registro de estadísticas
+        self.release_original()
+        if self.governor is not None:
+            self.governor.track(categorize(self.df_cleaned))
+        
         # Fase 3: Carga
         output_files = self.load_data(output_format)
         
         # Reporte final
         self.generate_summary_report()
+        if self.governor is not None:
+            self.governor.report()
+        
+        print("\n" + "=" * 80)
+        print("✅ PROCESO ETL COMPLETADO EXITOSAMENTE")
+        print("=" * 80)
+        
+        return True
+    
+    def register_query_views(self):
+        """
+        Registra las salidas del ETL (dataset limpio, particiones incrementales
+        y CSV original) como vistas de DuckDB para consultas analíticas
+        
+        Returns:
+            QueryLayer: Capa de consultas con las vistas registradas
+        """
+        if self.queries is None:
+            self.queries = QueryLayer()
+        self.queries.register_outputs(self.output_dir, self.file_path)
+        return self.queries
+    
+    def query(self, sql, params=None):
+        """
+        Ejecuta una consulta SQL sobre las vistas de las salidas del ETL;
+        solo el resultado se materializa en pandas
+        
+        Args:
+            sql (str): Consulta SQL (vistas: encuesta_limpia, encuesta_incremental,
+                encuesta_original)
+            params (list): Parámetros de la consulta
+        
+        Returns:
+            pd.DataFrame: Resultado de la consulta
+        """
+        if self.queries is None:
+            self.register_query_views()
+        return self.queries.query(sql, params)
+    
+    def exceeds_budget(self):
+        """
+        Estima la memoria del proceso en memoria frente al presupuesto
+        
+        Returns:
+            bool: True si el dataset debe procesarse por bloques
+        """
+        if self.governor is None:
+            return False
+        estimate = self.governor.estimate(self.file_path)
+        print(f"🧠 Memoria estimada en memoria: {estimate['estimated_memory_mb']:,.1f} MB "
+              f"(presupuesto: {self.governor.budget_mb:,.1f} MB)")
+        return self.governor.needs_spill()
+    
+    def run_spilled_etl(self, output_format='all'):
+        """
+        Ejecuta el proceso ETL por bloques cuando el dataset no cabe en el
+        presupuesto de memoria. Los bloques se vuelcan a disco en una primera
+        pasada (deduplicación y estadísticas globales) y se limpian y exportan
+        uno a uno en la segunda.
+        
+        Args:
+            output_format (str): Formato de salida ('csv', 'excel', 'parquet',
+                'all'); None limpia los bloques sin exportar archivos
+        """
+        print("⚠️ El dataset excede el presupuesto: procesamiento por bloques con volcado a disco")
+        print(f"   Tamaño de bloque: {self.governor.chunk_size:,} filas")
+        
+        # Solo se usan los acumuladores del estado incremental (no se persiste)
+        state = IncrementalState(state_dir=None)
+        spill_paths = []
+        rows = 0
+        try:
+            # Fase 1: Extracción por bloques (deduplicación global con huellas)
+            print("\n" + "=" * 80)
+            print("FASE 1: EXTRACCIÓN DE DATOS POR BLOQUES")
+            print("=" * 80)
+            
+            def read_and_spill():
+                nonlocal rows
+                for i, chunk in enumerate(self.governor.read_chunks(self.file_path)):
+                    if not state.columns:
+                        state.columns = chunk.columns.tolist()
+                    rows += len(chunk)
+                    spill_paths.append(self.governor.spill(state.register(chunk), f"bloque_{i:05d}"))
+                    yield chunk
+            
+            # Fase 2C: Índice de texto libre sobre cada bloque leído, antes de
+            # descartar duplicados (como en el proceso en memoria)
+            self.build_text_index(frames=read_and_spill())
+            
+            print(f"\n📋 Número de registros: {rows:,}")
+            print(f"📋 Registros únicos: {state.rows:,}")
+            print(f"📦 Bloques volcados a disco: {len(spill_paths)}")
+            
+            # Fase 2B y 3: Limpieza con estadísticas globales y exportación por bloques
+            missing_percentage = state.missing_percentage()
+            columns_to_drop = missing_percentage[missing_percentage > 80].index.tolist()
+            medians = state.medians()
+            
+            # Cada formato pedido se escribe bloque a bloque; Parquet se
+            # obtiene del CSV, que en ese caso es un archivo intermedio
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            csv_filename = self._output_path(f"kaggle_survey_cleaned_{timestamp}.csv")
+            write_csv = output_format in ['csv', 'parquet', 'all']
+            workbook = None
+            if output_format in ['excel', 'all']:
+                excel_filename = self._output_path(f"kaggle_survey_cleaned_{timestamp}.xlsx")
+                workbook, sheet = self._start_excel_stream()
+            
+            ledger = StatisticsLedger()
+            for i, path in enumerate(spill_paths):
+                cleaned = self.governor.track(self.clean_and_transform_data(
+                    df=self.governor.restore(path),
+                    columns_to_drop=columns_to_drop,
+                    medians=medians
+                ))
+                ledger.merge(self.ledger)
+                if write_csv:
+                    cleaned.to_csv(csv_filename, mode='a' if i else 'w', header=not i,
+                                   index=False, encoding='utf-8')
+                if workbook is not None:
+                    if ledger.final_rows >= EXCEL_MAX_ROWS:
+                        raise ValueError(
+                            f"El dataset limpio excede el límite de {EXCEL_MAX_ROWS - 1:,} "
+                            "filas de una hoja de Excel; use -f csv o -f parquet"
+                        )
+                    self._append_excel_rows(sheet, cleaned, header=not i)
+            self.df_cleaned = None
+            
+            # Los duplicados se descartaron con las huellas antes de limpiar
+            ledger.original_rows = rows
+            ledger.original_columns = len(state.columns)
+            ledger.record_duplicates(rows - state.rows)
+            self.ledger = ledger
+        finally:
+            self.governor.cleanup_spill()
+        
+        if output_format is not None:
+            print("\n" + "=" * 80)
+            print("FASE 3: CARGA DE DATOS")
+            print("=" * 80)
+            if output_format in ['csv', 'all']:
+                print(f"✅ Dataset exportado a CSV: {csv_filename}")
+            if workbook is not None:
+                print(self._finish_excel_stream(workbook, excel_filename))
+            if output_format == 'parquet':
+                # DuckDB convierte el CSV en streaming, sin cargarlo en memoria
+                parquet_filename = csv_filename[:-len('.csv')] + '.parquet'
+                csv_to_parquet(csv_filename, parquet_filename)
+                os.remove(csv_filename)
+                print(f"✅ Dataset exportado a Parquet: {parquet_filename}")
+            
+            metadata_filename = self._output_path(f"metadata_etl_{timestamp}.txt")
+            self._write_metadata(metadata_filename)
+            print(f"✅ Metadatos exportados: {metadata_filename}")
+        
+        # Reporte final
+        self.generate_summary_report()
+        self.governor.report()
         
         print("\n" + "=" * 80)
         print("✅ PROCESO ETL COMPLETADO EXITOSAMENTE")
         print("=" * 80)
         
         return True
+    
+    def run_incremental_etl(self, state_dir='estado_incremental'):
+        """
+        Ejecuta el proceso ETL solo sobre las respuestas nuevas
+        
+        Lee el CSV desde la marca de agua guardada, descarta las filas ya
+        procesadas mediante sus huellas, actualiza los acumuladores globales
+        (nulos por columna, medianas) y agrega una nueva partición limpia.
+        El esquema (columnas eliminadas) se congela en la primera ejecución.
+        
+        Args:
+            state_dir (str): Directorio del estado incremental (dentro de la salida)
+        
+        Returns:
+            str: Ruta de la partición generada (None si no hubo respuestas nuevas)
+        """
+        print("🚀 INICIANDO PROCESO ETL INCREMENTAL")
+        print("=" * 80)
+        
+        state = IncrementalState.load(self._output_path(state_dir))
+        
+        # Fase 1: Extracción (solo bytes nuevos del archivo)
+        df_new, new_offset, tail_hash = state.read_new_rows(self.file_path)
+        print(f"Filas leídas desde la marca de agua: {len(df_new):,}")
+        
+        self.df_original = state.register(df_new)
+        state.offset = new_offset
+        state.tail_hash = tail_hash
+        state.read_rows += len(df_new)
+        print(f"Filas nuevas (sin duplicados históricos): {len(self.df_original):,}")
+        print(f"Filas acumuladas: {state.rows:,}")
+        
+        if self.df_original.empty:
+            state.save()
+            print("✅ No hay respuestas nuevas para procesar")
+            return None
+        
+        # Fase 2C: Índice de texto libre (incremental por naturaleza). Se
+        # indexan todas las filas leídas, como en una lectura completa; sus
+        # etiquetas son posiciones en el CSV y no se repiten entre ejecuciones,
+        # así que cada lote se guarda como un segmento delta junto al estado.
+        # Si la ejecución falla antes de guardar el estado, el reintento
+        # escribe otro delta con las mismas filas y la fusión las omite
+        self.build_text_index(index_path=os.path.join(state_dir, 'indice_texto_libre.json.gz'),
+                              frames=[df_new], delta=True)
+        df_new = None
+        
+        # Fase 2B: Limpieza con estadísticas globales
+        if state.dropped_columns is None:
+            missing_percentage = state.missing_percentage()
+            state.dropped_columns = missing_percentage[missing_percentage > 80].index.tolist()
+        self.clean_and_transform_data(
+            columns_to_drop=state.dropped_columns,
+            medians=state.medians()
+        )
+        
+        drift = state.drifted_columns()
+        if drift:
+            print(f"⚠️ Columnas que cruzaron el umbral de 80% de nulos: {len(drift)}")
+            print(f"   Elimine {state.state_dir} para reconstruir la salida con el nuevo esquema")
+        
+        # Fase 3: Carga en una nueva partición
+        partition_dir = self._output_path('kaggle_survey_cleaned')
+        os.makedirs(partition_dir, exist_ok=True)
+        partition = os.path.join(partition_dir, f"part-{len(state.partitions):05d}.csv")
+        self._export_csv(partition)
+        state.partitions.append(partition)
+        state.save()
+        
+        print(f"✅ Partición exportada: {partition}")
+        print(f"📁 Particiones totales: {len(state.partitions)}")
+        return partition
+
+# Subcomandos del CLI: cada uno ejecuta el proceso hasta la fase indicada
+COMMANDS = {
+    'extract': 'Fase 1: carga el dataset y muestra su descripción',
+    'profile': 'Fases 1-2A: extracción y análisis exploratorio (EDA)',
+    'clean': 'Fases 1-2B: extracción, índice de texto libre y limpieza',
+    'export': 'Fases 1-3: limpieza y exportación de archivos',
+    'run': 'Proceso ETL completo (opción por defecto)',
+    'incremental': 'Procesa solo las respuestas nuevas y agrega una partición',
+    'query': 'Consulta SQL (DuckDB) sobre las salidas del ETL sin cargarlas en pandas',
+}
+
 
-def main():
+def build_parser():
     """
-    Función principal para ejecutar el proceso ETL
+    Construye el parser de argumentos del CLI
+    
+    Returns:
+        argparse.ArgumentParser: Parser con los subcomandos del proceso ETL
     """
-    # Configurar la ruta del archivo
-    file_path = "multipleChoiceResponses.csv"
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-i', '--input', default='multipleChoiceResponses.csv',
+                        help='Ruta al archivo CSV del dataset')
+    common.add_argument('-o', '--output', default='.',
+                        help='Directorio de salida para los archivos generados')
+    common.add_argument('-f', '--format', default='all', choices=['csv', 'excel', 'parquet', 'all'],
+                        help='Formato de exportación')
+    common.add_argument('-w', '--workers', type=int, default=1,
+                        help='Hilos para exportar los formatos en paralelo')
+    common.add_argument('-m', '--memory-budget', type=float, default=None,
+                        help='Presupuesto de memoria en MB (lectura por bloques y volcado a disco)')
+    
+    parser = argparse.ArgumentParser(
+        prog='etl_kaggle_survey',
+        description='Proceso ETL para el dataset de Kaggle Survey'
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='{' + ','.join(COMMANDS) + '}')
+    commands = {}
+    for name, help_text in COMMANDS.items():
+        commands[name] = subparsers.add_parser(name, parents=[common], help=help_text)
+    commands['query'].add_argument('sql', nargs='?',
+                                   help='Consulta SQL (sin consulta se listan las vistas)')
+    return parser
+
+
+def main(argv=None):
+    """
+    Función principal para ejecutar el proceso ETL desde la línea de comandos
+    
+    Args:
+        argv (list): Argumentos del CLI (por defecto sys.argv[1:])
+    
+    Returns:
+        int: Código de salida (0 si el proceso fue exitoso)
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    
+    # Sin subcomando se ejecuta el proceso completo
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ('-h', '--help')):
+        argv = ['run'] + argv
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    # El presupuesto de memoria solo aplica a los subcomandos que leen el
+    # dataset completo (incremental ya procesa solo las filas nuevas)
+    if args.memory_budget and args.command in ('incremental', 'query'):
+        parser.error(f"-m/--memory-budget no aplica al subcomando '{args.command}'")
+    
+    if args.command == 'query':
+        # Solo DuckDB: pandas se carga únicamente al materializar un resultado
+        from capa_consultas import QueryLayer
+        
+        try:
+            queries = QueryLayer()
+            queries.register_outputs(args.output, args.input)
+            if not args.sql:
+                for name, path in queries.views.items():
+                    print(f"  • {name}: {path}")
+                return 0
+            print(queries.query(args.sql).to_string(index=False))
+        except (ImportError, ValueError) as e:
+            print(f"❌ Error: {e}")
+            return 1
+        return 0
     
     # Verificar que el archivo existe
-    if not os.path.exists(file_path):
-        print(f"❌ Error: No se encontró el archivo {file_path}")
+    if not os.path.exists(args.input):
+        print(f"❌ Error: No se encontró el archivo {args.input}")
         print("Asegúrate de que el archivo esté en el directorio actual")
-        return
+        return 1
     
     # Crear instancia del ETL
-    etl = ETLKaggleSurvey(file_path)
-    
-    # Ejecutar proceso completo
-    success = etl.run_complete_etl(output_format='all')
-    
-    if success:
-        print("\n🎉 ¡Proceso ETL completado exitosamente!")
-        print("📁 Archivos generados:")
-        print("   • kaggle_survey_cleaned_[timestamp].csv")
-        print("   • kaggle_survey_cleaned_[timestamp].xlsx")
-        print("   • metadata_etl_[timestamp].txt")
-        print("\n📊 El dataset está listo para análisis en Power BI")
-    else:
-        print("\n❌ Error en el proceso ETL")
+    etl = ETLKaggleSurvey(args.input, output_dir=args.output, workers=args.workers,
+                          memory_budget_mb=args.memory_budget)
+    
+    if args.command == 'run':
+        success = etl.run_complete_etl(output_format=args.format)
+        
+        if success:
+            print("\n🎉 ¡Proceso ETL completado exitosamente!")
+            print("📁 Archivos generados:")
+            print("   • kaggle_survey_cleaned_[timestamp].csv")
+            print("   • kaggle_survey_cleaned_[timestamp].xlsx")
+            print("   • metadata_etl_[timestamp].txt")
+            print("\n📊 El dataset está listo para análisis en Power BI")
+        else:
+            print("\n❌ Error en el proceso ETL")
+        return 0 if success else 1
+    
+    if args.command == 'incremental':
+        etl.run_incremental_etl()
+        return 0
+    
+    # Si el dataset no cabe en el presupuesto, la limpieza y la exportación
+    # se hacen por bloques; extract y profile necesitan el dataset completo
+    if etl.exceeds_budget():
+        if args.command in ('extract', 'profile'):
+            print(f"❌ Error: '{args.command}' requiere el dataset completo en memoria "
+                  f"y excede el presupuesto de {args.memory_budget:,.1f} MB")
+            return 1
+        output_format = args.format if args.command == 'export' else None
+        return 0 if etl.run_spilled_etl(output_format) else 1
+    
+    # Fase 1: Extracción
+    if etl.extract_data() is None:
+        return 1
+    
+    if args.command == 'extract':
+        etl.describe_dataset()
+        return 0
+    
+    if args.command == 'profile':
+        etl.exploratory_data_analysis()
+        return 0
+    
+    # Fases 2C y 2B: Índice de texto libre, limpieza y transformación
+    etl.build_text_index()
+    etl.clean_and_transform_data()
+    
+    # El original ya no se necesita: los reportes leen el registro de estadísticas
+    etl.release_original()
+    if etl.governor is not None:
+        etl.governor.track(categorize(etl.df_cleaned))
+    
+    if args.command == 'export':
+        etl.load_data(args.format)
+    
+    etl.generate_summary_report()
+    if etl.governor is not None:
+        etl.governor.report()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
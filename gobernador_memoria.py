@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gobernador de memoria para el proceso ETL del dataset de Kaggle Survey
+
+Propósito: Ejecutar el ETL dentro de un presupuesto de memoria fijo
+(contenedores con límites estrictos). Estima el tamaño por fila a partir de
+una muestra, elige el tamaño de los bloques de lectura, reduce los tipos de
+datos y decide si los datos intermedios deben volcarse a disco.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Copias simultáneas del dataset durante la limpieza (original, copia de
+# trabajo y resultado de drop/rename) usadas para estimar el pico en memoria
+COPY_FACTOR = 3
+
+# Fracción del presupuesto asignada a cada bloque de lectura
+CHUNK_FRACTION = 0.2
+
+
+def downcast_types(df):
+    """
+    Reduce los tipos numéricos sin perder información: enteros al tipo más
+    pequeño posible y flotantes a float32 solo si la conversión es exacta
+
+    Args:
+        df (pd.DataFrame): Dataset a reducir (se modifica en el lugar)
+
+    Returns:
+        pd.DataFrame: El mismo dataset con tipos reducidos
+    """
+    for col in df.select_dtypes(include=[np.integer]).columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes(include=[np.floating]).columns:
+        downcast = df[col].astype('float32')
+        if ((downcast.astype('float64') == df[col]) | df[col].isna()).all():
+            df[col] = downcast
+    return df
+
+
+def categorize(df, max_ratio=0.5):
+    """
+    Convierte a 'category' las columnas de texto con pocos valores distintos.
+    Se aplica al dataset limpio (la limpieza trabaja sobre columnas object)
+
+    Args:
+        df (pd.DataFrame): Dataset limpio (se modifica en el lugar)
+        max_ratio (float): Proporción máxima de valores únicos por fila
+
+    Returns:
+        pd.DataFrame: El mismo dataset con columnas categóricas
+    """
+    for col in df.select_dtypes(include=['object']).columns:
+        if df[col].nunique() <= max_ratio * len(df):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def memory_mb(df):
+    """
+    Memoria ocupada por un DataFrame en MB
+    """
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+class MemoryGovernor:
+    """
+    Controla el uso de memoria del ETL a partir de un presupuesto en MB
+    """
+
+    def __init__(self, budget_mb, sample_rows=1000):
+        """
+        Inicializa el gobernador
+
+        Args:
+            budget_mb (float): Presupuesto de memoria en MB
+            sample_rows (int): Filas leídas para estimar el tamaño por fila
+        """
+        self.budget_mb = budget_mb
+        self.sample_rows = sample_rows
+        self.bytes_per_row = None
+        self.estimated_rows = None
+        self.chunk_size = None
+        self.text_columns = []
+        self.peak_data_mb = 0.0
+        self.spill_dir = None
+
+    def estimate(self, file_path):
+        """
+        Estima el tamaño por fila (ya con tipos reducidos) y el número de
+        filas del archivo a partir de una muestra
+
+        Args:
+            file_path (str): Ruta al archivo CSV del dataset
+
+        Returns:
+            dict: Bytes por fila, filas estimadas, memoria estimada y tamaño de bloque
+        """
+        with open(file_path, 'rb') as f:
+            lines = [f.readline() for _ in range(self.sample_rows + 1)]
+        lines = [line for line in lines if line]
+        bytes_per_line = max(1, sum(len(line) for line in lines[1:]) / max(1, len(lines) - 1))
+        self.estimated_rows = int(os.path.getsize(file_path) / bytes_per_line)
+
+        sample = downcast_types(pd.read_csv(file_path, nrows=self.sample_rows, encoding='utf-8'))
+        self.bytes_per_row = max(1, sample.memory_usage(deep=True).sum() / max(1, len(sample)))
+        # Las columnas de texto se leen siempre como object para que todos
+        # los bloques tengan los mismos tipos. Una columna vacía en la muestra
+        # se infiere como float, pero puede tener texto más adelante: solo se
+        # deja al parser la inferencia de las columnas numéricas con datos
+        numeric = [col for col in sample.select_dtypes(include=[np.number]).columns
+                   if sample[col].notna().any()]
+        self.text_columns = [col for col in sample.columns if col not in numeric]
+
+        budget_bytes = self.budget_mb * 1024**2
+        self.chunk_size = max(100, int(budget_bytes * CHUNK_FRACTION / self.bytes_per_row))
+
+        return {
+            'bytes_per_row': self.bytes_per_row,
+            'estimated_rows': self.estimated_rows,
+            'estimated_memory_mb': self.estimated_memory_mb(),
+            'chunk_size': self.chunk_size
+        }
+
+    def estimated_memory_mb(self):
+        """
+        Pico estimado si todo el proceso se hace en memoria
+        """
+        return self.bytes_per_row * self.estimated_rows * COPY_FACTOR / 1024**2
+
+    def needs_spill(self):
+        """
+        Indica si el proceso en memoria excedería el presupuesto
+        """
+        return self.estimated_memory_mb() > self.budget_mb
+
+    def read_chunks(self, file_path, **kwargs):
+        """
+        Lee el CSV en bloques del tamaño elegido, con tipos reducidos
+        (requiere haber llamado a estimate)
+
+        Args:
+            file_path (str): Ruta al archivo CSV del dataset
+
+        Yields:
+            pd.DataFrame: Bloque de filas
+        """
+        for chunk in pd.read_csv(file_path, chunksize=self.chunk_size, dtype=self._dtypes(),
+                                 encoding='utf-8', **kwargs):
+            yield self.track(downcast_types(chunk))
+
+    def read_all(self, file_path):
+        """
+        Lee el CSV completo en una sola pasada con los mismos tipos que
+        read_chunks (requiere haber llamado a estimate). El parser ensambla
+        cada columna liberando sus búferes a medida que avanza, por lo que
+        el pico es de una sola copia del dataset
+
+        Args:
+            file_path (str): Ruta al archivo CSV del dataset
+
+        Returns:
+            pd.DataFrame: Dataset completo con tipos reducidos
+        """
+        df = pd.read_csv(file_path, dtype=self._dtypes(), encoding='utf-8')
+        return self.track(downcast_types(df))
+
+    def _dtypes(self):
+        """
+        Tipos forzados en la lectura: las columnas de texto como object
+        """
+        return {col: object for col in self.text_columns}
+
+    def track(self, df):
+        """
+        Registra el tamaño de un DataFrame vivo para el reporte de pico
+
+        Returns:
+            pd.DataFrame: El mismo DataFrame
+        """
+        self.peak_data_mb = max(self.peak_data_mb, memory_mb(df))
+        return df
+
+    # ------------------------------------------------------------------
+    # Volcado a disco
+    # ------------------------------------------------------------------
+    def spill(self, df, name):
+        """
+        Guarda un DataFrame intermedio en disco (conserva los tipos)
+
+        Args:
+            df (pd.DataFrame): Datos intermedios
+            name (str): Nombre del archivo de volcado
+
+        Returns:
+            str: Ruta del archivo de volcado
+        """
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='etl_volcado_')
+        path = os.path.join(self.spill_dir, f"{name}.pkl")
+        df.to_pickle(path)
+        return path
+
+    def restore(self, path):
+        """
+        Carga un DataFrame volcado a disco
+        """
+        return self.track(pd.read_pickle(path))
+
+    def cleanup_spill(self):
+        """
+        Elimina los archivos de volcado
+        """
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    # ------------------------------------------------------------------
+    # Reporte
+    # ------------------------------------------------------------------
+    def report(self):
+        """
+        Imprime el uso de memoria real frente al presupuesto
+        """
+        print("\n🧠 USO DE MEMORIA:")
+        print(f"   • Presupuesto: {self.budget_mb:,.1f} MB")
+        if self.bytes_per_row is not None:
+            print(f"   • Tamaño estimado por fila: {self.bytes_per_row:,.0f} bytes")
+            print(f"   • Tamaño de bloque: {self.chunk_size:,} filas")
+        print(f"   • Pico de datos en memoria: {self.peak_data_mb:,.1f} MB")
+        rss = _peak_rss_mb()
+        if rss is not None:
+            print(f"   • Pico de memoria del proceso (RSS): {rss:,.1f} MB")
+
+
+def _peak_rss_mb():
+    """
+    Pico de memoria residente del proceso en MB (None si no está disponible)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS reporta bytes
+    return peak / 1024**2 if os.uname().sysname == 'Darwin' else peak / 1024
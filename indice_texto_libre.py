@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice invertido para las respuestas de texto libre (*_OTHER_TEXT)
+del dataset de Kaggle Survey
+
+Propósito: Tokenizar y normalizar una sola vez las respuestas escritas por los
+encuestados y permitir búsquedas rápidas por término, prefijo y similitud,
+además de tablas de frecuencia, sin recorrer el dataset con str.contains
+"""
+
+import bisect
+import difflib
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+# Sufijo que identifica las columnas de texto libre en el dataset original
+FREE_TEXT_SUFFIX = '_OTHER_TEXT'
+
+# Valores que Kaggle usa como marcador de "sin respuesta" en texto libre
+EMPTY_VALUES = {'', '-1', 'nan', 'none', 'no especificado'}
+
+# Tamaño de los bloques leídos al calcular la huella del archivo de entrada
+HASH_BLOCK_BYTES = 1024**2
+
+
+class FreeTextIndex:
+    """
+    Índice invertido persistente sobre las columnas *_OTHER_TEXT.
+
+    Mantiene:
+        - documents: doc_id -> (columna, fila, texto normalizado)
+        - postings: término -> conjunto de doc_id
+        - trigrams: trigrama -> conjunto de términos (búsqueda difusa)
+        - frequencies: columna -> conteo de respuestas normalizadas
+        - source: archivo de entrada indexado (ruta, tamaño y huella)
+
+    Se actualiza de forma incremental: las filas ya indexadas se omiten,
+    también al fusionar segmentos (un lote reintentado tras un fallo no
+    duplica respuestas ni frecuencias).
+    """
+
+    VERSION = 2
+
+    def __init__(self):
+        """
+        Inicializa un índice vacío
+        """
+        self.documents = []                   # doc_id -> [columna, fila, texto]
+        self.indexed_rows = set()             # {(columna, fila)}
+        self.postings = defaultdict(set)      # término -> {doc_id}
+        self.trigrams = defaultdict(set)      # trigrama -> {término}
+        self.frequencies = defaultdict(Counter)  # columna -> Counter(texto)
+        self.source = None                    # Identidad del archivo indexado
+        self._sorted_terms = None
+
+    # ------------------------------------------------------------------
+    # Normalización y tokenización
+    # ------------------------------------------------------------------
+    @staticmethod
+    def normalize_text(text):
+        """
+        Normaliza un texto: minúsculas, sin tildes, sin signos de puntuación
+        y con espacios colapsados
+
+        Args:
+            text: Valor original de la celda
+
+        Returns:
+            str: Texto normalizado ('' si no hay respuesta)
+        """
+        if text is None or (isinstance(text, float) and pd.isna(text)):
+            return ''
+        text = str(text).strip().lower()
+        if text in EMPTY_VALUES:
+            return ''
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+        text = re.sub(r'[^a-z0-9+#.]+', ' ', text)
+        text = re.sub(r'(?<![a-z0-9])\.|\.(?![a-z0-9])', ' ', text)
+        text = ' '.join(text.split())
+        return '' if text in EMPTY_VALUES else text
+
+    @classmethod
+    def tokenize(cls, text):
+        """
+        Divide un texto en términos normalizados
+
+        Args:
+            text: Valor original de la celda
+
+        Returns:
+            list: Lista de términos
+        """
+        return cls.normalize_text(text).split()
+
+    @staticmethod
+    def _trigrams_of(term):
+        """
+        Calcula los trigramas de un término (con relleno en los bordes)
+        """
+        padded = f"  {term} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    # ------------------------------------------------------------------
+    # Construcción incremental
+    # ------------------------------------------------------------------
+    def add_responses(self, df, columns=None):
+        """
+        Indexa las respuestas de texto libre de un DataFrame.
+        Las filas ya indexadas para una columna se omiten.
+
+        Args:
+            df (pd.DataFrame): Dataset con columnas *_OTHER_TEXT
+            columns (list): Columnas a indexar (por defecto todas las *_OTHER_TEXT)
+
+        Returns:
+            int: Número de respuestas nuevas indexadas
+        """
+        if columns is None:
+            columns = [c for c in df.columns if str(c).endswith(FREE_TEXT_SUFFIX)]
+
+        added = 0
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col].dropna()
+            for row, value in series.items():
+                key = (col, _to_json(row))
+                if key in self.indexed_rows:
+                    continue
+                self.indexed_rows.add(key)
+
+                text = self.normalize_text(value)
+                if not text:
+                    continue
+                self._add_document(col, key[1], text)
+                added += 1
+
+        return added
+
+    def _add_document(self, col, row, text):
+        """
+        Agrega una respuesta normalizada a los documentos, las frecuencias
+        y las listas invertidas
+        """
+        doc_id = len(self.documents)
+        self.documents.append([col, row, text])
+        self.frequencies[col][text] += 1
+        for term in set(text.split()):
+            if term not in self.postings:
+                for trigram in self._trigrams_of(term):
+                    self.trigrams[trigram].add(term)
+                self._sorted_terms = None
+            self.postings[term].add(doc_id)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def _rows(self, doc_ids, column=None):
+        """
+        Convierte identificadores de documento en filas del dataset
+        """
+        rows = set()
+        for doc_id in doc_ids:
+            col, row, _ = self.documents[doc_id]
+            if column is None or col == column:
+                rows.add(row)
+        try:
+            return sorted(rows)
+        except TypeError:
+            return sorted(rows, key=str)
+
+    def search_term(self, term, column=None):
+        """
+        Busca las filas que contienen todos los términos indicados
+
+        Args:
+            term (str): Término o frase a buscar
+            column (str): Restringir a una columna *_OTHER_TEXT
+
+        Returns:
+            list: Filas (índice del dataset) que coinciden
+        """
+        terms = self.tokenize(term)
+        if not terms:
+            return []
+        doc_ids = set(self.postings.get(terms[0], ()))
+        for t in terms[1:]:
+            doc_ids &= self.postings.get(t, set())
+        return self._rows(doc_ids, column)
+
+    def terms_with_prefix(self, prefix):
+        """
+        Lista los términos del vocabulario que empiezan por un prefijo
+
+        Args:
+            prefix (str): Prefijo a buscar
+
+        Returns:
+            list: Términos ordenados alfabéticamente
+        """
+        prefix = self.normalize_text(prefix)
+        if not prefix:
+            return []
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + '\uffff')
+        return self._sorted_terms[start:end]
+
+    def search_prefix(self, prefix, column=None):
+        """
+        Busca las filas con algún término que empiece por el prefijo
+
+        Args:
+            prefix (str): Prefijo a buscar
+            column (str): Restringir a una columna *_OTHER_TEXT
+
+        Returns:
+            list: Filas (índice del dataset) que coinciden
+        """
+        doc_ids = set()
+        for term in self.terms_with_prefix(prefix):
+            doc_ids |= self.postings[term]
+        return self._rows(doc_ids, column)
+
+    def similar_terms(self, term, threshold=0.75, limit=10):
+        """
+        Encuentra términos del vocabulario parecidos al indicado
+        (candidatos por trigramas, ordenados por similitud)
+
+        Args:
+            term (str): Término a buscar
+            threshold (float): Similitud mínima entre 0 y 1
+            limit (int): Número máximo de términos devueltos
+
+        Returns:
+            list: Tuplas (término, similitud) de mayor a menor similitud
+        """
+        term = self.normalize_text(term).replace(' ', '')
+        if not term:
+            return []
+
+        candidates = Counter()
+        for trigram in self._trigrams_of(term):
+            candidates.update(self.trigrams.get(trigram, ()))
+
+        similar = []
+        for candidate in candidates:
+            ratio = difflib.SequenceMatcher(None, term, candidate).ratio()
+            if ratio >= threshold:
+                similar.append((candidate, round(ratio, 3)))
+        similar.sort(key=lambda x: (-x[1], x[0]))
+        return similar[:limit]
+
+    def search_fuzzy(self, term, column=None, threshold=0.75):
+        """
+        Busca las filas con términos similares al indicado (errores de tipeo,
+        variantes de escritura)
+
+        Args:
+            term (str): Término a buscar
+            column (str): Restringir a una columna *_OTHER_TEXT
+            threshold (float): Similitud mínima entre 0 y 1
+
+        Returns:
+            list: Filas (índice del dataset) que coinciden
+        """
+        doc_ids = set()
+        for similar, _ in self.similar_terms(term, threshold, limit=None):
+            doc_ids |= self.postings[similar]
+        return self._rows(doc_ids, column)
+
+    def frequency_table(self, column=None, top=None):
+        """
+        Genera la tabla de frecuencias de respuestas escritas
+
+        Args:
+            column (str): Columna *_OTHER_TEXT (por defecto todas)
+            top (int): Número máximo de filas a devolver
+
+        Returns:
+            pd.DataFrame: Columnas 'Columna', 'Respuesta', 'Frecuencia'
+        """
+        columns = [column] if column is not None else sorted(self.frequencies)
+        records = []
+        for col in columns:
+            for text, count in self.frequencies.get(col, Counter()).items():
+                records.append((col, text, count))
+
+        table = pd.DataFrame(records, columns=['Columna', 'Respuesta', 'Frecuencia'])
+        table = table.sort_values(['Frecuencia', 'Respuesta'], ascending=[False, True])
+        if top is not None:
+            table = table.head(top)
+        return table.reset_index(drop=True)
+
+    def summary(self):
+        """
+        Devuelve un resumen del tamaño del índice
+
+        Returns:
+            dict: Respuestas, términos y columnas indexadas
+        """
+        return {
+            'responses': len(self.documents),
+            'terms': len(self.postings),
+            'columns': len(self.frequencies)
+        }
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def save(self, path):
+        """
+        Guarda el índice completo en disco (JSON comprimido con gzip) y
+        elimina los segmentos delta que ya quedaron incluidos
+
+        Args:
+            path (str): Ruta del archivo de índice
+        """
+        self._write(path)
+        for delta_path in self._delta_paths(path):
+            os.remove(delta_path)
+
+    def save_delta(self, path):
+        """
+        Guarda el índice como un segmento delta junto al archivo principal,
+        sin leer ni reescribir lo ya guardado. Los últimos deltas se fusionan
+        mientras el último ocupe al menos la mitad del anterior, de modo que
+        hay O(log n) segmentos.
+
+        Args:
+            path (str): Ruta del archivo de índice principal
+
+        Returns:
+            int: Número de segmentos delta tras la fusión
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        deltas = self._delta_paths(path)
+        number = int(deltas[-1].rsplit('-', 1)[1]) + 1 if deltas else 0
+        deltas.append(f"{path}.delta-{number:05d}")
+        self._write(deltas[-1])
+
+        while len(deltas) >= 2:
+            previous, last = deltas[-2:]
+            if 2 * os.path.getsize(last) < os.path.getsize(previous):
+                break
+            merged = self._read(previous)
+            merged._merge(self._read(last))
+            number += 1
+            deltas[-2:] = [f"{path}.delta-{number:05d}"]
+            merged._write(deltas[-1])
+            os.remove(previous)
+            os.remove(last)
+        return len(deltas)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un índice previamente guardado (archivo principal y deltas)
+
+        Args:
+            path (str): Ruta del archivo de índice
+
+        Returns:
+            FreeTextIndex: Índice reconstruido
+        """
+        index = cls._read(path) if os.path.exists(path) else cls()
+        for delta_path in cls._delta_paths(path):
+            index._merge(cls._read(delta_path))
+        return index
+
+    def _write(self, path):
+        """
+        Escribe el contenido del índice en un archivo (escritura atómica)
+        """
+        data = {
+            'version': self.VERSION,
+            'source': self.source,
+            'documents': self.documents,
+            'indexed_rows': [list(key) for key in self.indexed_rows],
+            'postings': {t: sorted(ids) for t, ids in self.postings.items()},
+            'frequencies': {c: dict(f) for c, f in self.frequencies.items()}
+        }
+        temp_path = f"{path}.tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def _read(cls, path):
+        """
+        Lee un archivo de índice (principal o delta)
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"Versión de índice no soportada: {data.get('version')}")
+
+        index = cls()
+        index.source = data.get('source')
+        index.documents = data['documents']
+        index.indexed_rows = {tuple(key) for key in data['indexed_rows']}
+        for term, ids in data['postings'].items():
+            index.postings[term] = set(ids)
+            for trigram in cls._trigrams_of(term):
+                index.trigrams[trigram].add(term)
+        for col, counts in data['frequencies'].items():
+            index.frequencies[col] = Counter(counts)
+        return index
+
+    def _merge(self, other):
+        """
+        Incorpora los documentos de otro índice, omitiendo las filas que ya
+        están indexadas (p. ej. un segmento reescrito al reintentar un lote)
+        """
+        for col, row, text in other.documents:
+            if (col, row) in self.indexed_rows:
+                continue
+            self.indexed_rows.add((col, row))
+            self._add_document(col, row, text)
+        self.indexed_rows |= other.indexed_rows
+
+    @staticmethod
+    def _delta_paths(path):
+        """
+        Segmentos delta de un índice, en orden de creación
+        """
+        return sorted(p for p in glob.glob(f"{glob.escape(path)}.delta-*")
+                      if not p.endswith('.tmp'))
+
+
+def source_identity(file_path, previous=None):
+    """
+    Identidad de un archivo de entrada (ruta, tamaño y huella SHA-1 del
+    contenido), calculada en una sola lectura por bloques
+
+    Args:
+        file_path (str): Ruta al archivo CSV del dataset
+        previous (dict): Identidad guardada en el índice; en la misma lectura
+            se comprueba si el archivo la conserva como prefijo
+
+    Returns:
+        tuple: (identidad del archivo, True si es el archivo de previous o
+            solo se le agregaron filas al final)
+    """
+    prefix_size = previous['size'] if previous else None
+    prefix_sha1 = None
+    digest = hashlib.sha1()
+    size = 0
+    with open(file_path, 'rb') as f:
+        while True:
+            limit = HASH_BLOCK_BYTES
+            if prefix_size is not None and size < prefix_size:
+                limit = min(limit, prefix_size - size)
+            block = f.read(limit)
+            if not block:
+                break
+            digest.update(block)
+            size += len(block)
+            if size == prefix_size:
+                prefix_sha1 = digest.hexdigest()
+
+    identity = {'path': os.path.abspath(file_path), 'size': size, 'sha1': digest.hexdigest()}
+    return identity, previous is not None and prefix_sha1 == previous['sha1']
+
+
+def _to_json(value):
+    """
+    Convierte etiquetas de fila de numpy a tipos nativos serializables
+    """
+    return value.item() if hasattr(value, 'item') else value
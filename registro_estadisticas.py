@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de linaje y estadísticas del proceso ETL del dataset de Kaggle Survey
+
+Propósito: Cada paso de limpieza anota lo que hizo (filas y columnas
+eliminadas, valores imputados y convertidos por columna, columnas renombradas)
+mientras se ejecuta, de modo que los reportes, los metadatos y el resumen de
+Excel se generan en tiempo constante, sin volver a recorrer los datos y sin
+mantener el dataset original en memoria.
+"""
+
+
+class StatisticsLedger:
+    """
+    Registro de lo que cada paso de limpieza hizo sobre el dataset
+    """
+
+    def __init__(self, rows=0, columns=0):
+        """
+        Inicializa el registro con las dimensiones del dataset de entrada
+
+        Args:
+            rows (int): Registros del dataset de entrada
+            columns (int): Columnas del dataset de entrada
+        """
+        self.original_rows = rows
+        self.original_columns = columns
+        self.duplicate_rows = 0
+        self.dropped_columns = []
+        self.imputed = {}          # columna -> valores nulos imputados
+        self.coerced = {}          # columna -> valores convertidos a nulo
+        self.renamed = {}          # nombre original -> nombre nuevo
+        self.derived = []
+        self.remaining_nulls = 0   # nulos que quedan tras la imputación
+        self.final_rows = rows
+        self.final_columns = columns
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Crea un registro a partir de las dimensiones de un DataFrame
+
+        Args:
+            df (pd.DataFrame): Dataset de entrada
+
+        Returns:
+            StatisticsLedger: Registro vacío
+        """
+        return cls(*df.shape)
+
+    # ------------------------------------------------------------------
+    # Anotaciones de los pasos de limpieza
+    # ------------------------------------------------------------------
+    def record_duplicates(self, count):
+        """
+        Anota registros eliminados por duplicación
+        """
+        self.duplicate_rows += int(count)
+
+    def record_dropped(self, columns):
+        """
+        Anota columnas eliminadas (sin repetir)
+        """
+        self.dropped_columns.extend(c for c in columns if c not in self.dropped_columns)
+
+    def record_imputed(self, column, count):
+        """
+        Anota valores nulos imputados en una columna
+        """
+        if count:
+            self.imputed[column] = self.imputed.get(column, 0) + int(count)
+
+    def record_coerced(self, column, count):
+        """
+        Anota valores convertidos a nulo al cambiar el tipo de una columna
+        """
+        if count:
+            self.coerced[column] = self.coerced.get(column, 0) + int(count)
+
+    def record_renamed(self, mapping):
+        """
+        Anota las columnas efectivamente renombradas
+        """
+        self.renamed.update({k: v for k, v in mapping.items() if k != v})
+
+    def record_derived(self, column):
+        """
+        Anota una columna derivada creada
+        """
+        if column not in self.derived:
+            self.derived.append(column)
+
+    def finalize(self, rows, columns):
+        """
+        Registra las dimensiones del dataset limpio
+
+        Args:
+            rows (int): Registros finales
+            columns (int): Columnas finales
+        """
+        self.final_rows = rows
+        self.final_columns = columns
+
+    # ------------------------------------------------------------------
+    # Métricas derivadas (tiempo constante)
+    # ------------------------------------------------------------------
+    @property
+    def total_imputed(self):
+        """
+        Total de valores nulos imputados
+        """
+        return sum(self.imputed.values())
+
+    @property
+    def total_coerced(self):
+        """
+        Total de valores convertidos a nulo
+        """
+        return sum(self.coerced.values())
+
+    @property
+    def final_nulls(self):
+        """
+        Valores nulos que quedan en el dataset limpio
+        """
+        return self.remaining_nulls + self.total_coerced
+
+    def retention_rate(self):
+        """
+        Porcentaje de registros que sobreviven a la limpieza
+        """
+        return self.final_rows / self.original_rows * 100 if self.original_rows else 0.0
+
+    def completeness(self):
+        """
+        Porcentaje de celdas no nulas en el dataset limpio
+        """
+        cells = self.final_rows * self.final_columns
+        return (1 - self.final_nulls / cells) * 100 if cells else 0.0
+
+    # ------------------------------------------------------------------
+    # Combinación de registros (procesamiento por bloques)
+    # ------------------------------------------------------------------
+    def merge(self, other):
+        """
+        Acumula el registro de otro bloque procesado con el mismo esquema
+
+        Args:
+            other (StatisticsLedger): Registro del bloque
+
+        Returns:
+            StatisticsLedger: Este mismo registro
+        """
+        self.original_rows += other.original_rows
+        self.original_columns = max(self.original_columns, other.original_columns)
+        self.record_duplicates(other.duplicate_rows)
+        self.record_dropped(other.dropped_columns)
+        for column, count in other.imputed.items():
+            self.record_imputed(column, count)
+        for column, count in other.coerced.items():
+            self.record_coerced(column, count)
+        self.record_renamed(other.renamed)
+        for column in other.derived:
+            self.record_derived(column)
+        self.remaining_nulls += other.remaining_nulls
+        self.final_rows += other.final_rows
+        self.final_columns = max(self.final_columns, other.final_columns)
+        return self
+
+    def summary(self):
+        """
+        Tabla de métricas para reportes y la hoja 'Resumen_Cambios'
+
+        Returns:
+            list: Tuplas (métrica, valor)
+        """
+        return [
+            ('Registros originales', self.original_rows),
+            ('Registros finales', self.final_rows),
+            ('Columnas originales', self.original_columns),
+            ('Columnas finales', self.final_columns),
+            ('Registros duplicados eliminados', self.duplicate_rows),
+            ('Columnas eliminadas (>80% nulos)', len(self.dropped_columns)),
+            ('Valores nulos imputados', self.total_imputed),
+            ('Valores convertidos a nulo (tipos)', self.total_coerced),
+            ('Columnas renombradas', len(self.renamed)),
+            ('Columnas derivadas', len(self.derived))
+        ]
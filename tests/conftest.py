@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Datos de prueba compartidos: respuestas sintéticas con la estructura del
+dataset de Kaggle Survey (columnas numéricas, categóricas y *_OTHER_TEXT)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Los módulos del proceso ETL están en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def survey():
+    """
+    1.200 respuestas distintas (el tiempo total no se repite)
+    """
+    rng = np.random.default_rng(2019)
+    rows = 1200
+
+    def choice(values, p_missing=0.0):
+        column = rng.choice(values, rows).astype(object)
+        column[rng.random(rows) < p_missing] = np.nan
+        return column
+
+    return pd.DataFrame({
+        'Time from Start to Finish (seconds)': rng.permutation(rows) + 300,
+        'Q1': choice(['18-21', '22-24', '25-29', '30-34']),
+        'Q2': choice(['Female', 'Male']),
+        'Q3': choice(['Chile', 'Peru', 'United States of America']),
+        'Q6': choice(['Student', 'Data Scientist', 'Software Engineer'], 0.2),
+        'Q6_OTHER_TEXT': choice(['-1', 'python dev', 'ML enginer', 'data engineer'], 0.3),
+        'Q9': choice(['0-10,000', '10-20,000', '50-60,000'], 0.25),
+        'Q11_Part_1': choice(['Jupyter/IPython'], 0.4),
+        'Q11_OTHER_TEXT': choice(['Emacs', 'vim', 'Spyder'], 0.9),
+        'Q26': choice([1.0, 2.0], 0.5),
+    })
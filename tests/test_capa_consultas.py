@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la capa de consultas DuckDB sobre las salidas del ETL
+"""
+
+import pytest
+
+from etl_kaggle_survey import main
+
+pytest.importorskip('duckdb')
+
+
+def test_query_errors_are_reported_without_traceback(tmp_path, capsys):
+    assert main(['query', '-o', str(tmp_path), 'SELECT COUNT(*) FROM encuesta_limpia']) == 1
+    assert capsys.readouterr().out.startswith('❌ Error: Catalog Error')
+
+    assert main(['query', '-o', str(tmp_path), 'SELEC 1']) == 1
+    assert capsys.readouterr().out.startswith('❌ Error: Parser Error')
+
+
+def test_query_over_cleaned_output(tmp_path, survey, capsys):
+    path = tmp_path / 'encuesta.csv'
+    survey.to_csv(path, index=False)
+    assert main(['export', '-i', str(path), '-o', str(tmp_path), '-f', 'csv']) == 0
+    capsys.readouterr()
+
+    assert main(['query', '-o', str(tmp_path), 'SELECT COUNT(*) AS n FROM encuesta_limpia']) == 0
+    assert capsys.readouterr().out.split() == ['n', str(len(survey))]
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la ingesta incremental: marca de agua, reintentos tras un fallo
+y detección de archivos regenerados
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from etl_kaggle_survey import ETLKaggleSurvey
+from indice_texto_libre import FreeTextIndex
+
+
+def run_incremental(path, output_dir):
+    """
+    Ejecuta una pasada incremental sobre el CSV indicado
+    """
+    return ETLKaggleSurvey(str(path), output_dir=str(output_dir)).run_incremental_etl()
+
+
+def test_appended_rows_go_to_a_new_partition(tmp_path, survey):
+    path = tmp_path / 'encuesta.csv'
+    survey.head(500).to_csv(path, index=False)
+    first = run_incremental(path, tmp_path / 'salida')
+
+    survey.head(800).to_csv(path, index=False)
+    second = run_incremental(path, tmp_path / 'salida')
+
+    assert len(pd.read_csv(first)) == 500
+    assert len(pd.read_csv(second)) == 300
+    assert run_incremental(path, tmp_path / 'salida') is None
+
+
+def test_rewritten_input_is_rejected(tmp_path, survey):
+    path = tmp_path / 'encuesta.csv'
+    survey.head(500).to_csv(path, index=False)
+    run_incremental(path, tmp_path / 'salida')
+
+    # Mismo encabezado y archivo más grande, pero con las filas reordenadas
+    survey.sample(700, random_state=1).to_csv(path, index=False)
+    with pytest.raises(ValueError, match='no es una extensión'):
+        run_incremental(path, tmp_path / 'salida')
+
+    partitions = os.listdir(tmp_path / 'salida' / 'kaggle_survey_cleaned')
+    assert partitions == ['part-00000.csv']
+
+
+def test_failed_run_can_be_retried(tmp_path, survey, monkeypatch):
+    path = tmp_path / 'encuesta.csv'
+    output_dir = tmp_path / 'salida'
+    survey.head(600).to_csv(path, index=False)
+    run_incremental(path, output_dir)
+
+    # El lote nuevo se indexa y luego falla la exportación: el estado no se guarda
+    survey.head(1000).to_csv(path, index=False)
+
+    def fail_export(self, csv_filename):
+        raise OSError('disco lleno')
+
+    monkeypatch.setattr(ETLKaggleSurvey, '_export_csv', fail_export)
+    with pytest.raises(OSError):
+        run_incremental(path, output_dir)
+    monkeypatch.undo()
+    partition = run_incremental(path, output_dir)
+
+    assert len(pd.read_csv(partition)) == 400
+    index = FreeTextIndex.load(str(output_dir / 'estado_incremental' / 'indice_texto_libre.json.gz'))
+    expected = FreeTextIndex()
+    expected.add_responses(pd.read_csv(path))
+    assert index.summary() == expected.summary()
+    assert index.frequency_table().equals(expected.frequency_table())
+    assert index.search_term('python dev') == expected.search_term('python dev')
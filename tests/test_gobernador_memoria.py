@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del proceso por bloques con presupuesto de memoria
+"""
+
+import glob
+import os
+
+import pandas as pd
+
+from etl_kaggle_survey import ETLKaggleSurvey
+
+
+def run_etl(path, output_dir, output_format, memory_budget_mb=None):
+    """
+    Ejecuta el proceso completo y devuelve los archivos generados
+    """
+    etl = ETLKaggleSurvey(str(path), output_dir=str(output_dir), memory_budget_mb=memory_budget_mb)
+    assert etl.run_complete_etl(output_format)
+    return sorted(os.path.basename(p) for p in glob.glob(str(output_dir / 'kaggle_survey_cleaned_*')))
+
+
+def test_spilled_excel_matches_in_memory_export(tmp_path, survey):
+    path = tmp_path / 'encuesta.csv'
+    pd.concat([survey, survey.head(200)]).to_csv(path, index=False)
+
+    spilled = run_etl(path, tmp_path / 'bloques', 'excel', memory_budget_mb=0.1)
+    run_etl(path, tmp_path / 'memoria', 'excel')
+
+    assert len(spilled) == 1 and spilled[0].endswith('.xlsx')
+    for sheet in ['Datos_Limpios', 'Resumen_Cambios']:
+        expected = pd.read_excel(glob.glob(str(tmp_path / 'memoria' / '*.xlsx'))[0], sheet_name=sheet)
+        actual = pd.read_excel(str(tmp_path / 'bloques' / spilled[0]), sheet_name=sheet)
+        pd.testing.assert_frame_equal(actual, expected)
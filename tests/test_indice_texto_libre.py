@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de texto libre persistente en el directorio de salida
+"""
+
+from etl_kaggle_survey import ETLKaggleSurvey
+from indice_texto_libre import FreeTextIndex
+
+
+def build_index(path, output_dir):
+    """
+    Carga el CSV y actualiza el índice del directorio de salida
+    """
+    etl = ETLKaggleSurvey(str(path), output_dir=str(output_dir))
+    etl.extract_data()
+    return etl.build_text_index()
+
+
+def test_index_is_rebuilt_for_another_input(tmp_path, survey):
+    first = tmp_path / 'a.csv'
+    survey.head(600).to_csv(first, index=False)
+    build_index(first, tmp_path / 'salida')
+
+    second = tmp_path / 'b.csv'
+    survey.head(600).assign(Q6_OTHER_TEXT='kubernetes').to_csv(second, index=False)
+    index = build_index(second, tmp_path / 'salida')
+
+    assert index.search_term('python dev') == []
+    assert len(index.search_term('kubernetes', column='Q6_OTHER_TEXT')) == 600
+
+
+def test_index_is_extended_for_appended_rows(tmp_path, survey, capsys):
+    path = tmp_path / 'encuesta.csv'
+    survey.head(600).to_csv(path, index=False)
+    build_index(path, tmp_path / 'salida')
+
+    survey.head(1000).to_csv(path, index=False)
+    capsys.readouterr()
+    index = build_index(path, tmp_path / 'salida')
+
+    output = capsys.readouterr().out
+    assert 'Índice existente cargado' in output
+    assert 'Respuestas nuevas indexadas: ' in output and 'se reconstruye' not in output
+
+    expected = FreeTextIndex()
+    expected.add_responses(survey.head(1000))
+    assert index.summary() == expected.summary()
+    assert index.frequency_table().equals(expected.frequency_table())